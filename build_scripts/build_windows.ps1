@@ -1,17 +1,47 @@
+param(
+  # 既存の build ディレクトリを削除してクリーンビルドする
+  [switch]$Clean
+)
+
 $py = python -c "import sys, pathlib; print(pathlib.Path(sys.executable).resolve())"
 Write-Host "Using Python: $py"
 & $py build_scripts/generate_cmake_presets.py
 & $py --version
 
-cmake -B build --preset=default `
-  -DPython_EXECUTABLE="$py" `
-  -DPython3_EXECUTABLE="$py" `
-  -DPython_ROOT_DIR="$(Split-Path $py)" `
-  -DPython_FIND_STRATEGY=LOCATION `
-  -DPython_FIND_REGISTRY=NEVER `
-  -DPython3_FIND_REGISTRY=NEVER `
-  -DPython_FIND_FRAMEWORK=NEVER `
-  -DPython3_FIND_FRAMEWORK=NEVER
+$buildDir = "build"
+if ($Clean -and (Test-Path $buildDir)) {
+  Write-Host "Removing $buildDir (clean build)"
+  Remove-Item -Recurse -Force $buildDir
+}
+
+$configureArgs = @(
+  "-B", $buildDir, "--preset=default",
+  "-DPython_EXECUTABLE=$py",
+  "-DPython3_EXECUTABLE=$py",
+  "-DPython_ROOT_DIR=$(Split-Path $py)",
+  "-DPython_FIND_STRATEGY=LOCATION",
+  "-DPython_FIND_REGISTRY=NEVER",
+  "-DPython3_FIND_REGISTRY=NEVER",
+  "-DPython_FIND_FRAMEWORK=NEVER",
+  "-DPython3_FIND_FRAMEWORK=NEVER"
+)
+
+# configure 引数 (Python インタプリタ・プリセットを含む) が前回と同じで
+# CMakeCache.txt が残っていれば configure を省略し、インクリメンタルビルドする
+$stampFile = Join-Path $buildDir ".configure-stamp"
+$presetsFile = "CMakeUserPresets.json"
+$stamp = ($configureArgs -join "`n") + "`n" + (Get-Content -Raw $presetsFile)
+$cacheFile = Join-Path $buildDir "CMakeCache.txt"
+$needsConfigure = -not (Test-Path $cacheFile) -or -not (Test-Path $stampFile) `
+  -or ((Get-Content -Raw $stampFile) -ne $stamp)
+
+if ($needsConfigure) {
+  cmake @configureArgs
+  if ($LASTEXITCODE -ne 0) { exit $LASTEXITCODE }
+  Set-Content -NoNewline -Path $stampFile -Value $stamp
+} else {
+  Write-Host "CMake cache is up to date — skipping configure"
+}
 
-cmake --build build --config Release -j
-cmake --install build --config Release
+# install ターゲットは ALL に依存するため、build と install を 1 回の呼び出しで行う
+cmake --build $buildDir --config Release -j --target install
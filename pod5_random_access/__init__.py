@@ -1,4 +1,4 @@
-from .build import build_pod5_index
+from .build import build_pod5_index, write_index_bundle
 from .reader import Pod5RandomAccessReader
 
-__all__ = ["Pod5RandomAccessReader", "build_pod5_index"]
+__all__ = ["Pod5RandomAccessReader", "build_pod5_index", "write_index_bundle"]
@@ -1,27 +1,116 @@
 from __future__ import annotations
 
+import multiprocessing
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import shutil
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
 from logging import getLogger
 from pathlib import Path
+from typing import Literal
 
-from .pod5_random_access_pybind import Pod5Index
-from .reader import INDEX_SUFFIX, _is_rotational
+from .pod5_random_access_pybind import build_indices
+from .reader import (
+    BUNDLE_NAME,
+    INDEX_SUFFIX,
+    _BUNDLE_HEADER,
+    _BUNDLE_MAGIC,
+    _BUNDLE_NAME_LEN,
+    _BUNDLE_RANGE,
+    _BUNDLE_SOURCE,
+    _BUNDLE_VERSION,
+    _is_rotational,
+    _queue_depth,
+    _walk_files,
+)
 
 logger = getLogger(__name__)
 
+BUILD_WORKERS_ENV = "POD5_BUILD_WORKERS"
+"""自動判別されるワーカー数を上書きする環境変数名。"""
 
-def _build_single(pod5_path: Path) -> None:
-    """1 つの pod5 ファイルに対してインデックスをビルドし保存する。"""
-    index_path = pod5_path.parent / (pod5_path.name + INDEX_SUFFIX)
-    if index_path.exists():
-        logger.debug("Index already exists, skipping: %s", index_path)
-        return
+_MIN_SSD_WORKERS = 4
+_MAX_SSD_WORKERS = 32
+_MAX_BATCH_SIZE = 32
 
-    indexer = Pod5Index(str(pod5_path))
-    indexer.build_index()
-    indexer.save_index(str(index_path))
-    logger.info("Built index: %s", index_path)
+
+def _ssd_workers(pod5_dir: Path) -> int:
+    """
+    SSD 上での並列ワーカー数をデバイスのキュー深さから決める。
+
+    /sys/block/<dev>/queue/nr_requests が読めればその値を、
+    読めなければ os.cpu_count() * 2 を使い、[4, 32] にクランプする。
+    """
+    depth = _queue_depth(pod5_dir)
+    if depth is None:
+        depth = (os.cpu_count() or 1) * 2
+    return max(_MIN_SSD_WORKERS, min(_MAX_SSD_WORKERS, depth))
+
+
+def _env_workers() -> int | None:
+    """環境変数 POD5_BUILD_WORKERS からワーカー数を読む。未設定・不正値なら None。"""
+    value = os.environ.get(BUILD_WORKERS_ENV)
+    if not value:
+        return None
+    try:
+        workers = int(value)
+    except ValueError:
+        workers = 0
+    if workers < 1:
+        logger.warning("Ignoring invalid %s=%r", BUILD_WORKERS_ENV, value)
+        return None
+    return workers
+
+
+def _scan_pod5(root: Path) -> tuple[list[Path], set[Path]]:
+    """
+    root 以下の .pod5 ファイルを os.scandir で再帰的に列挙する。
+
+    rglob と異なりエントリごとの追加 stat を行わず、
+    ソートもパス文字列のまま 1 回だけ行う。
+    同じ走査で既存のインデックスファイルも収集するため、
+    ビルド対象の判定にファイルごとの exists() が不要になる。
+
+    Returns:
+        (ソート済み .pod5 パスのリスト, 既存インデックスファイルのパスの集合)。
+        root が "." などでも比較が一致するよう、集合は Path で持つ。
+    """
+    pod5_suffix = ".pod5"
+    index_suffix = pod5_suffix + INDEX_SUFFIX
+    found: list[str] = []
+    indexed: set[Path] = set()
+    for entry in _walk_files(root, (pod5_suffix, index_suffix)):
+        if entry.name.endswith(pod5_suffix):
+            found.append(entry.path)
+        else:
+            indexed.add(Path(entry.path))
+    found.sort()
+    return [Path(p) for p in found], indexed
+
+
+def _build_batch(
+    pod5_paths: list[Path], index_paths: list[Path]
+) -> list[tuple[Path, str]]:
+    """
+    複数の pod5 ファイルのインデックスを 1 回の C++ 呼び出しでビルドし保存する。
+
+    Returns:
+        ビルドに失敗した (pod5 ファイルパス, エラーメッセージ) のリスト。
+    """
+    errors = build_indices(
+        [str(p) for p in pod5_paths], [str(p) for p in index_paths]
+    )
+    failed: list[tuple[Path, str]] = []
+    for pod5_path, index_path, error in zip(pod5_paths, index_paths, errors):
+        if error:
+            failed.append((pod5_path, error))
+        else:
+            logger.info("Built index: %s", index_path)
+    return failed
 
 
 def build_pod5_index(
@@ -29,6 +118,7 @@ def build_pod5_index(
     *,
     max_workers: int | None = None,
     force: bool = False,
+    executor_type: Literal["thread", "process"] = "thread",
 ) -> list[Path]:
     """
     ディレクトリ内の全 .pod5 ファイルに対してインデックスをビルドし保存する。
@@ -36,35 +126,49 @@ def build_pod5_index(
     既存の .pod5.idx があるファイルはスキップする（force=True で強制再ビルド）。
     SSD 上では自動的にマルチスレッドで並列ビルドし、
     HDD 上では順次ビルドする。
+    Pod5Index.build_index() は GIL を解放するため、スレッドで並列化できる。
 
     Args:
         pod5_dir: .pod5 ファイルを含むディレクトリ。
         max_workers: 並列ワーカー数。
-            None: SSD なら os.cpu_count()、HDD または判別不能なら 1（自動判別）。
+            None: 環境変数 POD5_BUILD_WORKERS が設定されていればその値。
+                未設定なら自動判別し、SSD ではデバイスのキュー深さ
+                (nr_requests、読めなければ os.cpu_count() * 2) を [4, 32] に
+                クランプした値、HDD または判別不能なら 1。
             1: 強制順次処理。
             N (>1): 強制 N 並列。
         force: True の場合、既存の .pod5.idx を無視して再ビルドする。
+        executor_type: 並列ビルドに使う executor の種類。
+            "thread": ThreadPoolExecutor（デフォルト）。
+            "process": spawn コンテキストの ProcessPoolExecutor。
+                GIL の影響を受けずに CPU を使い切りたい場合に指定する。
 
     Returns:
         ビルド対象となった pod5 ファイルのパスのリスト。
+
+    Raises:
+        NotADirectoryError: pod5_dir がディレクトリでない場合。
+        ValueError: executor_type が不正な場合。
     """
+    if executor_type not in ("thread", "process"):
+        raise ValueError(
+            f"executor_type must be 'thread' or 'process', got {executor_type!r}"
+        )
     pod5_dir = Path(pod5_dir)
     if not pod5_dir.is_dir():
         raise NotADirectoryError(f"{pod5_dir} is not a directory")
 
-    all_pod5 = sorted(pod5_dir.rglob("*.pod5"))
+    all_pod5, indexed = _scan_pod5(pod5_dir)
     if not all_pod5:
         logger.warning("No .pod5 files found in %s", pod5_dir)
         return []
 
     # --- ビルド対象の選別 ---
+    index_paths = {f: f.parent / (f.name + INDEX_SUFFIX) for f in all_pod5}
     if force:
         targets = all_pod5
     else:
-        targets = [
-            f for f in all_pod5
-            if not (f.parent / (f.name + INDEX_SUFFIX)).exists()
-        ]
+        targets = [f for f in all_pod5 if index_paths[f] not in indexed]
 
     if not targets:
         logger.info("All index files already exist — nothing to build")
@@ -76,31 +180,130 @@ def build_pod5_index(
     )
 
     # --- ワーカー数の決定 ---
+    if max_workers is None:
+        max_workers = _env_workers()
+        if max_workers is not None:
+            logger.debug("%s set — using %d workers", BUILD_WORKERS_ENV, max_workers)
     if max_workers is None:
         rotational = _is_rotational(pod5_dir)
         if rotational is None or rotational:
             max_workers = 1
             logger.debug("HDD or unknown disk type — sequential build")
         else:
-            max_workers = os.cpu_count() or 1
+            max_workers = _ssd_workers(pod5_dir)
             logger.debug("SSD detected — using %d workers", max_workers)
 
+    # --- バッチ分割 ---
+    # pybind 呼び出しをバッチ単位にまとめつつ、全ワーカーに仕事が行き渡る大きさにする
+    batch_size = max(1, min(_MAX_BATCH_SIZE, -(-len(targets) // max_workers)))
+    batches = [
+        targets[i : i + batch_size] for i in range(0, len(targets), batch_size)
+    ]
+
     # --- 順次ビルド ---
     if max_workers == 1:
-        for f in targets:
-            _build_single(f)
+        for batch in batches:
+            failed = _build_batch(batch, [index_paths[f] for f in batch])
+            if failed:
+                pod5_file, error = failed[0]
+                raise RuntimeError(
+                    f"Failed to build index for {pod5_file.name}: {error}"
+                )
         return targets
 
     # --- 並列ビルド (SSD) ---
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(_build_single, f): f for f in targets}
+    executor: Executor
+    if executor_type == "process":
+        executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    else:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+    with executor:
+        futures = {
+            executor.submit(
+                _build_batch, batch, [index_paths[f] for f in batch]
+            ): batch
+            for batch in batches
+        }
         for future in as_completed(futures):
-            pod5_file = futures[future]
             try:
-                future.result()
+                failed = future.result()
             except Exception:
                 logger.error(
-                    "Failed to build index for %s", pod5_file.name, exc_info=True
+                    "Failed to build index for %s",
+                    ", ".join(f.name for f in futures[future]),
+                    exc_info=True,
+                )
+                continue
+            for pod5_file, error in failed:
+                logger.error(
+                    "Failed to build index for %s: %s", pod5_file.name, error
                 )
 
     return targets
+
+
+def write_index_bundle(pod5_dir: str | Path) -> Path:
+    """
+    ディレクトリ内の .pod5.idx を 1 つの index.bundle にまとめて保存する。
+
+    Pod5RandomAccessReader.add_pod5_dir はバンドルがあれば
+    ファイルごとの .pod5.idx を確認せず、バンドルから遅延ロードする。
+    .pod5.idx がないファイルは含めないため、事前に build_pod5_index を実行しておく。
+    目次には pod5 ファイルのサイズと mtime も記録し、
+    その後に置き換えられたファイルのエントリはリーダー側で無視される。
+    書き込みは一時ファイル経由で行い、完成後に置き換える。
+
+    Args:
+        pod5_dir: .pod5 ファイルを含むディレクトリ。
+
+    Returns:
+        作成したバンドルファイルのパス。
+
+    Raises:
+        NotADirectoryError: pod5_dir がディレクトリでない場合。
+    """
+    pod5_dir = Path(pod5_dir)
+    if not pod5_dir.is_dir():
+        raise NotADirectoryError(f"{pod5_dir} is not a directory")
+
+    all_pod5, indexed = _scan_pod5(pod5_dir)
+    members: list[tuple[bytes, Path, int, os.stat_result]] = []
+    for f in all_pod5:
+        index_path = f.parent / (f.name + INDEX_SUFFIX)
+        if index_path not in indexed:
+            logger.warning("No index for %s — not bundled", f.name)
+            continue
+        name = f.relative_to(pod5_dir).as_posix().encode("utf-8")
+        members.append((name, index_path, index_path.stat().st_size, f.stat()))
+
+    # 目次のサイズが決まれば各インデックスのオフセットも決まる
+    offset = _BUNDLE_HEADER.size + sum(
+        _BUNDLE_NAME_LEN.size + len(name) + _BUNDLE_RANGE.size + _BUNDLE_SOURCE.size
+        for name, _, _, _ in members
+    )
+    bundle_path = pod5_dir / BUNDLE_NAME
+    tmp_path = bundle_path.with_name(bundle_path.name + ".tmp")
+    try:
+        with open(tmp_path, "wb") as out:
+            out.write(
+                _BUNDLE_HEADER.pack(_BUNDLE_MAGIC, _BUNDLE_VERSION, 0, len(members))
+            )
+            for name, _, size, st in members:
+                out.write(_BUNDLE_NAME_LEN.pack(len(name)))
+                out.write(name)
+                out.write(_BUNDLE_RANGE.pack(offset, size))
+                out.write(_BUNDLE_SOURCE.pack(st.st_size, st.st_mtime_ns))
+                offset += size
+            for _, index_path, _, _ in members:
+                with open(index_path, "rb") as src:
+                    shutil.copyfileobj(src, out)
+        os.replace(tmp_path, bundle_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    logger.info("Bundled %d index files into %s", len(members), bundle_path)
+    return bundle_path
@@ -7,7 +7,7 @@ import numpy as np
 import numpy.typing as npt
 from typing import Iterable
 
-__all__ = ["Pod5Index", "SigLoc"]
+__all__ = ["Pod5Index", "SigLoc", "build_indices"]
 
 class Pod5Index:
     def __init__(self, pod5_file: str) -> None: ...
@@ -20,12 +20,24 @@ class Pod5Index:
     def load_index(self, path: str) -> None:
         """バイナリファイルからインデックスを読み込み"""
 
+    def load_index_range(self, path: str, offset: int, length: int) -> None:
+        """ファイル内の [offset, offset + length) からインデックスを読み込み"""
+
     def fetch_signal(self, uuid: bytes | str) -> npt.NDArray[np.int16]:
         """Signal Table から直接シグナルを取得 (numpy int16 array)"""
 
+    def fetch_signals(self, uuids: Iterable[bytes | str]) -> list[npt.NDArray[np.int16]]:
+        """複数 UUID のシグナルを物理位置順に一括取得し、入力順のリストで返す"""
+
     def fetch_pA_signal(self, uuid: bytes | str) -> npt.NDArray[np.float32]:
         """pA キャリブレーション済みシグナルを取得 (numpy float32 array)"""
 
+    def fetch_signal_into(self, uuid: bytes | str, out: npt.NDArray[np.int16]) -> int:
+        """シグナルを int16 配列 out の先頭に書き込み、サンプル数を返す"""
+
+    def fetch_pA_signal_into(self, uuid: bytes | str, out: npt.NDArray[np.float32]) -> int:
+        """pA シグナルを float32 配列 out の先頭に書き込み、サンプル数を返す"""
+
     def get_calibration(self, uuid: bytes | str) -> tuple[float, float]:
         """インデックスから (offset, scale) タプルを返す"""
 
@@ -43,6 +55,15 @@ class Pod5Index:
     def get_signal_row_starts(self, uuids: Iterable[bytes | str]) -> npt.NDArray[np.uint64]:
         """UUID リストの signal_row_start を一括取得 (numpy uint64 array)"""
 
+    def get_signal_row_starts_array(
+        self, uuids: npt.NDArray[np.uint8]
+    ) -> npt.NDArray[np.uint64]:
+        """(N, 16) uint8 配列の UUID の signal_row_start を一括取得 (numpy uint64 array)"""
+    def sort_indices_by_signal_row(
+        self, uuids: npt.NDArray[np.uint8]
+    ) -> npt.NDArray[np.int64]:
+        """(N, 16) uint8 配列の UUID を signal_row_start 昇順に並べる順列を返す (numpy int64 array)"""
+
 class SigLoc:
     def __repr__(self) -> str: ...
     @property
@@ -55,3 +76,6 @@ class SigLoc:
     def calibration_offset(self) -> float: ...
     @property
     def calibration_scale(self) -> float: ...
+
+def build_indices(pod5_files: list[str], index_paths: list[str]) -> list[str]:
+    """複数の pod5 ファイルのインデックスを一括ビルドして保存し、ファイルごとのエラーメッセージ (成功時は空文字列) を返す"""
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import functools
 import os
+import struct
+import threading
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
 from logging import getLogger
-from operator import itemgetter
 from pathlib import Path
-from typing import Any, Callable, Iterator, Sequence, TypeVar
+from typing import Any, Callable, Iterable, Iterator, Sequence, TypeVar
+from uuid import UUID
 
 import numpy as np
 import numpy.typing as npt
@@ -16,31 +21,289 @@ T = TypeVar("T")
 
 INDEX_SUFFIX = ".idx"
 
+BUNDLE_NAME = "index.bundle"
+"""ディレクトリ直下に置く、複数ファイルのインデックスをまとめたバンドルのファイル名。"""
+
+# バンドル形式: ヘッダ (magic, version, reserved, ファイル数) の後に
+# エントリごとの (名前長, 名前, オフセット, 長さ) が並び、
+# 続いて各ファイルの .pod5.idx と同じ内容が連結される。
+_BUNDLE_MAGIC = b"P5BDL\0"
+_BUNDLE_VERSION = 2
+_BUNDLE_HEADER = struct.Struct("<6sHHQ")
+_BUNDLE_NAME_LEN = struct.Struct("<I")
+_BUNDLE_RANGE = struct.Struct("<QQ")
+# バンドル作成時の pod5 ファイルの (サイズ, mtime_ns)。変わっていればエントリを使わない
+_BUNDLE_SOURCE = struct.Struct("<Qq")
+
+
+_DevId = tuple[int, int]
+
+_ROTATIONAL_MAP: dict[_DevId, bool | None] = {}
+"""デバイス番号 (major, minor) → rotational かどうか。None は判別不能。"""
+_QUEUE_DIRS: dict[_DevId, Path] = {}
+"""デバイス番号 (major, minor) → /sys/block/<dev>/queue ディレクトリ。"""
+_BLOCK_MAP_LOCK = threading.Lock()
+
+
+def _read_devid(dev_file: Path) -> _DevId | None:
+    """sysfs の dev ファイル ("8:1") をデバイス番号に変換する。"""
+    try:
+        major, minor = dev_file.read_text().strip().split(":")
+        return int(major), int(minor)
+    except (OSError, ValueError):
+        return None
+
+
+def _build_rotational_map() -> tuple[dict[_DevId, bool | None], dict[_DevId, Path]]:
+    """
+    /sys/block を 1 回走査し、デバイス番号から rotational と queue を引く表を作る。
+
+    パーティション (sda1) は親デバイス (sda) の値に対応付ける。
+    """
+    rotational: dict[_DevId, bool | None] = {}
+    queues: dict[_DevId, Path] = {}
+    try:
+        disks = list(Path("/sys/block").iterdir())
+    except OSError:
+        return rotational, queues
+    for disk in disks:
+        queue = disk / "queue"
+        try:
+            rot: bool | None = (queue / "rotational").read_text().strip() == "1"
+        except OSError:
+            rot = None
+        try:
+            parts = [p for p in disk.iterdir() if (p / "partition").exists()]
+        except OSError:
+            parts = []
+        for entry in (disk, *parts):
+            devid = _read_devid(entry / "dev")
+            if devid is not None:
+                rotational[devid] = rot
+                queues[devid] = queue
+    return rotational, queues
+
+
+def _block_devid(path: Path) -> _DevId:
+    """パスが存在するデバイスの番号を返す。表にない場合は /sys/block を再走査する。"""
+    st = os.stat(path)
+    devid = (os.major(st.st_dev), os.minor(st.st_dev))
+    if devid not in _ROTATIONAL_MAP:
+        with _BLOCK_MAP_LOCK:
+            if devid not in _ROTATIONAL_MAP:
+                rotational, queues = _build_rotational_map()
+                # 再走査でも見つからないデバイス (tmpfs 等) は None として記録する
+                rotational.setdefault(devid, None)
+                _ROTATIONAL_MAP.update(rotational)
+                _QUEUE_DIRS.update(queues)
+    return devid
+
 
 def _is_rotational(path: Path) -> bool | None:
     """
     パスが存在するディスクが HDD (rotational) かどうかを判別する。
 
-    Linux の /sys/dev/block を参照して判定する。
+    Linux の /sys/block を 1 回走査した表を参照して判定する。
+    表にないデバイスに出会ったときだけ再走査する。
     Linux 以外や判別不能な場合は None を返す。
 
     Returns:
         True: HDD, False: SSD, None: 判別不能。
     """
     try:
-        st = os.stat(path)
-        major = os.major(st.st_dev)
-        minor = os.minor(st.st_dev)
-        sysfs = Path(f"/sys/dev/block/{major}:{minor}").resolve()
-        # パーティション (sda1) の場合は親デバイス (sda) を辿る
-        while sysfs.parent.name != "block":
-            sysfs = sysfs.parent
-        rotational = sysfs / "queue" / "rotational"
-        return rotational.read_text().strip() == "1"
-    except (OSError, ValueError):
+        return _ROTATIONAL_MAP[_block_devid(path)]
+    except (OSError, ValueError, AttributeError):
         return None
 
 
+def _queue_depth(path: Path) -> int | None:
+    """
+    パスが存在するブロックデバイスのリクエストキュー深さ (nr_requests) を返す。
+
+    Linux 以外や判別不能な場合は None を返す。
+    """
+    try:
+        queue = _QUEUE_DIRS.get(_block_devid(path))
+        if queue is None:
+            return None
+        return int((queue / "nr_requests").read_text().strip())
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _uuid_str_to_bytes(u: str) -> bytes:
+    return UUID(u).bytes
+
+
+def _normalize_uuid(u: bytes | str) -> bytes:
+    """
+    UUID を 16 byte の bytes に正規化する。
+
+    str は 1 度だけパースして結果をキャッシュする。それ以外はそのまま返し、
+    型や長さの検証は C++ 側 (to_read_id) に任せる。
+    ホットループでは最初から bytes を渡すのが最も速い。
+    """
+    if isinstance(u, str):
+        return _uuid_str_to_bytes(u)
+    return u
+
+
+def _read_bundle_directory(
+    bundle_path: Path,
+) -> dict[str, tuple[int, int, int, int]]:
+    """
+    バンドルファイルの目次を読み、
+    相対パス → (オフセット, 長さ, pod5 のサイズ, pod5 の mtime_ns) を返す。
+
+    インデックス本体は読まない。
+
+    Raises:
+        OSError: ファイルを開けない場合。
+        ValueError: 形式が不正な場合。
+    """
+    with open(bundle_path, "rb") as f:
+        header = f.read(_BUNDLE_HEADER.size)
+        if len(header) != _BUNDLE_HEADER.size:
+            raise ValueError(f"{bundle_path} is truncated")
+        magic, version, _, count = _BUNDLE_HEADER.unpack(header)
+        if magic != _BUNDLE_MAGIC or version != _BUNDLE_VERSION:
+            raise ValueError(f"{bundle_path} is not an index bundle")
+        entries: dict[str, tuple[int, int, int, int]] = {}
+        for _ in range(count):
+            raw = f.read(_BUNDLE_NAME_LEN.size)
+            if len(raw) != _BUNDLE_NAME_LEN.size:
+                raise ValueError(f"{bundle_path} is truncated")
+            (name_len,) = _BUNDLE_NAME_LEN.unpack(raw)
+            name = f.read(name_len)
+            raw = f.read(_BUNDLE_RANGE.size + _BUNDLE_SOURCE.size)
+            if (
+                len(name) != name_len
+                or len(raw) != _BUNDLE_RANGE.size + _BUNDLE_SOURCE.size
+            ):
+                raise ValueError(f"{bundle_path} is truncated")
+            entries[name.decode("utf-8")] = _BUNDLE_RANGE.unpack_from(
+                raw
+            ) + _BUNDLE_SOURCE.unpack_from(raw, _BUNDLE_RANGE.size)
+    return entries
+
+
+def _uuid_array(uuids: list[bytes]) -> npt.NDArray[np.uint8] | None:
+    """
+    正規化済み UUID のリストを (N, 16) uint8 配列にまとめる。
+
+    16 byte でない要素が含まれる場合は None を返す。
+    """
+    if not all(isinstance(u, bytes) and len(u) == 16 for u in uuids):
+        return None
+    return np.frombuffer(b"".join(uuids), dtype=np.uint8).reshape(-1, 16)
+
+
+def _resolved(indexer: Pod5Index) -> Future[Pod5Index]:
+    """結果が設定済みの Future を返す。"""
+    fut: Future[Pod5Index] = Future()
+    fut.set_result(indexer)
+    return fut
+
+
+def _walk_files(root: Path, suffixes: tuple[str, ...]) -> Iterator[os.DirEntry[str]]:
+    """
+    root 以下で名前が suffixes のいずれかで終わるファイルを os.scandir で再帰的に列挙する。
+
+    rglob と異なりエントリごとの追加 stat や Path の生成を行わない。
+    ディレクトリのシンボリックリンクは辿らない。
+    rglob と同様、読めないサブディレクトリ (lost+found など) はスキップする。
+    """
+    root_path = os.fspath(root)
+    stack = [root_path]
+    while stack:
+        path = stack.pop()
+        try:
+            it = os.scandir(path)
+        except OSError as e:
+            if path == root_path:
+                raise
+            logger.warning("Skipping unreadable directory %s: %s", path, e)
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(suffixes):
+                    yield entry
+
+
+def _walk_pod5(root: Path) -> Iterator[Path]:
+    """root 以下の .pod5 ファイルを再帰的に列挙する（順序は不定）。"""
+    for entry in _walk_files(root, (".pod5",)):
+        yield Path(entry.path)
+
+
+def _index_names_in(directory: Path) -> set[str]:
+    """ディレクトリ直下に存在するインデックスファイル名の集合を返す。"""
+    try:
+        with os.scandir(directory) as it:
+            return {e.name for e in it if e.name.endswith(INDEX_SUFFIX)}
+    except OSError:
+        return set()
+
+
+class _ArrayPool:
+    """
+    1 次元 ndarray をスレッドごとに再利用するプール。
+
+    長さを 2 のべき乗に切り上げたバケツ単位で保持し、
+    acquire で取り出し、release で返却する。
+    貸し出し中の配列は弱参照で追跡し、それ以外の配列は受け付けない。
+    """
+
+    def __init__(self, max_per_bucket: int = 4) -> None:
+        self._local = threading.local()
+        self._max_per_bucket = max_per_bucket
+        # id(配列) → 貸し出し中の配列。返却されずに破棄された配列は自動で消える
+        self._lent: weakref.WeakValueDictionary[int, np.ndarray] = (
+            weakref.WeakValueDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def _buckets(self) -> dict[tuple[str, int], list[np.ndarray]]:
+        try:
+            return self._local.buckets
+        except AttributeError:
+            self._local.buckets = {}
+            return self._local.buckets
+
+    @staticmethod
+    def _bucket_size(n: int) -> int:
+        return 1 << max(n - 1, 0).bit_length()
+
+    def acquire(self, n: int, dtype: npt.DTypeLike) -> np.ndarray:
+        """長さ n 以上の配列を返す。プールが空なら新たに確保する。"""
+        dtype = np.dtype(dtype)
+        size = self._bucket_size(n)
+        bucket = self._buckets().get((dtype.str, size))
+        arr = bucket.pop() if bucket else np.empty(size, dtype=dtype)
+        with self._lock:
+            self._lent[id(arr)] = arr
+        return arr
+
+    def release(self, arr: np.ndarray) -> None:
+        """
+        acquire で得た配列（またはそのスライス）をプールに返却する。
+
+        Raises:
+            ValueError: このプールが貸し出した配列でない場合、または返却済みの場合。
+        """
+        base = arr if arr.base is None else arr.base
+        with self._lock:
+            if self._lent.get(id(base)) is not base:
+                raise ValueError("array was not acquired from this pool")
+            del self._lent[id(base)]
+        bucket = self._buckets().setdefault((base.dtype.str, base.shape[0]), [])
+        if len(bucket) < self._max_per_bucket:
+            bucket.append(base)
+
+
 class Pod5RandomAccessReader:
     """
     Pod5 ファイルからインデックスを使ってシグナルを読み込むクラス。
@@ -63,9 +326,16 @@ class Pod5RandomAccessReader:
 
     def __init__(self, *, save_index: bool = True) -> None:
         self._pod5_paths: dict[str, Path] = {}
-        self._indexers: dict[str, Pod5Index] = {}
+        # 値は Future: 最初にアクセスしたスレッドだけがロードし、他は結果を待つ
+        self._indexers: dict[str, Future[Pod5Index]] = {}
+        self._lock = threading.Lock()
+        # ファイル名 → 物理位置順にソート済みの read_id リスト
+        self._sorted_cache: dict[str, list[str]] = {}
+        # ファイル名 → (バンドルのパス, オフセット, 長さ)。バンドル経由で登録したファイルのみ
+        self._bundle_entries: dict[str, tuple[Path, int, int]] = {}
         self.save_index = save_index
         """インデックスファイルの自動保存を行うかどうかのデフォルト値。"""
+        self._pool = _ArrayPool()
 
     @staticmethod
     def _index_path_for(pod5_path: Path) -> Path:
@@ -79,9 +349,18 @@ class Pod5RandomAccessReader:
         Args:
             pod5_path: pod5 ファイルの絶対パス。
 
+        バンドル経由で登録されたファイルは、バンドル内の該当範囲だけを読み込む。
+
         Raises:
             FileNotFoundError: .pod5.idx が存在しない場合。
         """
+        bundle = self._bundle_entries.get(pod5_path.name)
+        if bundle is not None:
+            bundle_path, offset, length = bundle
+            indexer = Pod5Index(str(pod5_path))
+            indexer.load_index_range(str(bundle_path), offset, length)
+            logger.debug("Loaded index for %s from %s", pod5_path.name, bundle_path)
+            return indexer
         index_path = self._index_path_for(pod5_path)
         if not index_path.exists():
             raise FileNotFoundError(f"Index file not found: {index_path}")
@@ -121,7 +400,10 @@ class Pod5RandomAccessReader:
     # ------------------------------------------------------------------
 
     def add_pod5(
-        self, pod5_path: str | Path, *, save_index: bool | None = None
+        self,
+        pod5_path: str | Path,
+        *,
+        save_index: bool | None = None,
     ) -> None:
         """
         Pod5 ファイルを追加する。
@@ -139,39 +421,105 @@ class Pod5RandomAccessReader:
             save_index = self.save_index
         name = pod5_path.name
         self._pod5_paths[name] = pod5_path
+        self._sorted_cache.pop(name, None)
+        self._bundle_entries.pop(name, None)
 
-        index_path = self._index_path_for(pod5_path)
-        if index_path.exists():
+        if self._index_path_for(pod5_path).exists():
             # 遅延ロード: _get_indexer で初回アクセス時にロードされる
             logger.debug("Index found for %s — deferred loading", name)
         else:
             # 即座にビルド
-            self._indexers[name] = self._build_indexer(
-                pod5_path, save_index=save_index
+            self._indexers[name] = _resolved(
+                self._build_indexer(pod5_path, save_index=save_index)
             )
 
-    def add_pod5_dir(self, pod5_dir: str | Path) -> None:
+    def add_pod5_dir(
+        self, pod5_dir: str | Path, *, max_workers: int | None = None
+    ) -> None:
         """
         ディレクトリ内の全 .pod5 ファイルを再帰的に探索して追加する。
 
         各ファイルについて add_pod5 と同じルールで処理する:
         - .pod5.idx が存在する → パスのみ登録（遅延ロード）
-        - .pod5.idx が存在しない → 即座にビルド＋保存
+        - .pod5.idx が存在しない → 即座にビルド＋保存（スレッドで並列）
+
+        ディレクトリ直下に index.bundle (build.write_index_bundle で作成) があれば、
+        その目次に含まれるファイルは .pod5.idx を確認せずバンドルから遅延ロードする。
+        バンドル作成後に pod5 ファイルのサイズか mtime が変わっていれば、
+        そのエントリは使わず .pod5.idx にフォールバックする。
 
         Args:
             pod5_dir: 探索するディレクトリ。
+            max_workers: インデックスビルドの並列スレッド数。
+                None の場合は min(8, ビルド対象のファイル数)。1 で順次ビルド。
+
+        Raises:
+            NotADirectoryError: pod5_dir がディレクトリでない場合。
+            ValueError: max_workers が 1 未満の場合。
         """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError(f"max_workers must be >= 1, got {max_workers}")
         pod5_dir = Path(pod5_dir)
         if not pod5_dir.is_dir():
             raise NotADirectoryError(f"{pod5_dir} is not a directory")
 
-        pod5_files = sorted(pod5_dir.rglob("*.pod5"))
+        pod5_files = sorted(_walk_pod5(pod5_dir))
         if not pod5_files:
             logger.warning("No .pod5 files found in %s", pod5_dir)
             return
 
+        bundle_path = (pod5_dir / BUNDLE_NAME).resolve()
+        bundle: dict[str, tuple[int, int, int, int]] = {}
+        if bundle_path.is_file():
+            try:
+                bundle = _read_bundle_directory(bundle_path)
+            except (OSError, ValueError) as e:
+                logger.warning("Ignoring index bundle %s: %s", bundle_path, e)
+
+        # パス登録と .idx の有無の判定はメインスレッドで行う
+        # ファイルごとの stat を避けるため、親ディレクトリを 1 回ずつ scandir する
+        existing_idx: dict[Path, set[str]] = {}
+        needs_build: list[Path] = []
         for f in pod5_files:
-            self.add_pod5(f)
+            pod5_path = f.resolve()
+            self._pod5_paths[pod5_path.name] = pod5_path
+            self._sorted_cache.pop(pod5_path.name, None)
+            self._bundle_entries.pop(pod5_path.name, None)
+            entry = bundle.get(f.relative_to(pod5_dir).as_posix())
+            if entry is not None:
+                offset, length, size, mtime_ns = entry
+                st = pod5_path.stat()
+                if (st.st_size, st.st_mtime_ns) == (size, mtime_ns):
+                    self._bundle_entries[pod5_path.name] = (bundle_path, offset, length)
+                    continue
+                logger.warning(
+                    "Stale bundle entry for %s — falling back to %s",
+                    pod5_path.name, self._index_path_for(pod5_path).name,
+                )
+            parent = pod5_path.parent
+            if parent not in existing_idx:
+                existing_idx[parent] = _index_names_in(parent)
+            if self._index_path_for(pod5_path).name not in existing_idx[parent]:
+                needs_build.append(pod5_path)
+
+        # build_index() は GIL を解放するため、未ビルドのファイルはスレッドで並列ビルドする
+        if needs_build:
+            build = functools.partial(self._build_indexer, save_index=self.save_index)
+            workers = max_workers or min(8, len(needs_build))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(build, p) for p in needs_build]
+                for pod5_path, fut in zip(needs_build, futures):
+                    self._indexers[pod5_path.name] = fut
+            # 失敗したビルドは取り除いてから、最初の例外を送出する
+            failed = [
+                (pod5_path.name, fut)
+                for pod5_path, fut in zip(needs_build, futures)
+                if fut.exception() is not None
+            ]
+            for name, fut in failed:
+                self._discard_indexer(name, fut)
+            if failed:
+                failed[0][1].result()
 
         logger.info("Registered %d pod5 files from %s", len(pod5_files), pod5_dir)
 
@@ -180,10 +528,38 @@ class Pod5RandomAccessReader:
     # ------------------------------------------------------------------
 
     def __getstate__(self) -> dict[str, Any]:
-        """pickle 時に Pod5Index (C++ オブジェクト) を除外する。_pod5_paths は保持される。"""
-        state = self.__dict__.copy()
-        state["_indexers"] = {}
-        return state
+        """
+        pickle にはファイルの所在と設定だけを含める。
+
+        Pod5Index (C++ オブジェクト)・キャッシュ・ロック・配列プールは含めず、
+        復元後は初回アクセス時に .pod5.idx (またはバンドル) から遅延ロードする。
+        """
+        return {
+            "_pod5_paths": dict(self._pod5_paths),
+            "_bundle_entries": dict(self._bundle_entries),
+            "save_index": self.save_index,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """
+        pickle 復元時にキャッシュを空にし、ロックと配列プールを作り直す。
+
+        古いバージョンの pickle に含まれる余分な属性 (_indexers など) は捨て、
+        含まれない属性は既定値で補う。
+        """
+        self._pod5_paths = state["_pod5_paths"]
+        self._bundle_entries = state.get("_bundle_entries", {})
+        self.save_index = state.get("save_index", True)
+        self._indexers = {}
+        self._sorted_cache = {}
+        self._lock = threading.Lock()
+        self._pool = _ArrayPool()
+
+    def _discard_indexer(self, pod5_file_name: str, fut: Future[Pod5Index]) -> None:
+        """失敗したエントリを取り除き、次回アクセスで再試行できるようにする。"""
+        with self._lock:
+            if self._indexers.get(pod5_file_name) is fut:
+                del self._indexers[pod5_file_name]
 
     def _get_indexer(self, pod5_file_name: str) -> Pod5Index:
         """
@@ -191,20 +567,31 @@ class Pod5RandomAccessReader:
 
         add_pod5_dir で登録済みのファイルや、pickle 復元後のファイルは
         初回アクセス時に自動でロードされる。
+        複数スレッドから同時にアクセスされても、ロードはファイルごとに 1 回だけ行う。
 
         Args:
             pod5_file_name: Pod5 ファイル名。
         """
-        if pod5_file_name not in self._indexers:
+        fut = self._indexers.get(pod5_file_name)
+        if fut is None:
             if pod5_file_name not in self._pod5_paths:
                 raise KeyError(
                     f"Pod5 file '{pod5_file_name}' not registered. "
                     "Call add_pod5() or add_pod5_dir() first."
                 )
-            self._indexers[pod5_file_name] = self._load_indexer(
-                self._pod5_paths[pod5_file_name]
-            )
-        return self._indexers[pod5_file_name]
+            new: Future[Pod5Index] = Future()
+            with self._lock:
+                fut = self._indexers.setdefault(pod5_file_name, new)
+            if fut is new:
+                try:
+                    fut.set_result(
+                        self._load_indexer(self._pod5_paths[pod5_file_name])
+                    )
+                except BaseException as e:
+                    self._discard_indexer(pod5_file_name, fut)
+                    fut.set_exception(e)
+                    raise
+        return fut.result()
 
     # ------------------------------------------------------------------
     #  インデックス情報
@@ -224,27 +611,76 @@ class Pod5RandomAccessReader:
         Args:
             pod5_file_name: Pod5 ファイル名。
             sort: True の場合、Signal Table 上の物理位置順にソートして返す。
+                ソート結果はファイルごとにキャッシュされ、2 回目以降は再ソートしない。
 
         Returns:
             read_id 文字列のリスト。
         """
-        indexer = self._get_indexer(pod5_file_name)
-        read_ids = indexer.list_read_ids()
         if sort:
-            read_ids = indexer.sort_uuids_by_location(read_ids)
+            return list(self._sorted_read_ids(pod5_file_name))
+        return self._get_indexer(pod5_file_name).list_read_ids()
+
+    def _sorted_read_ids(self, pod5_file_name: str) -> list[str]:
+        """物理位置順の read_id リストをキャッシュから返す（呼び出し側で変更しないこと）。"""
+        read_ids = self._sorted_cache.get(pod5_file_name)
+        if read_ids is None:
+            indexer = self._get_indexer(pod5_file_name)
+            read_ids = indexer.sort_uuids_by_location(indexer.list_read_ids())
+            self._sorted_cache[pod5_file_name] = read_ids
         return read_ids
 
-    def iter_read_ids(self) -> Iterator[tuple[str, str]]:
+    def iter_read_ids(self, *, prefetch: bool = False) -> Iterator[tuple[str, str]]:
         """
         全ファイルの (filename, read_id) を Signal Table 物理位置順に yield する。
 
         ファイルごとに signal_row_start 昇順でイテレートするため、
         この順番で fetch_signal を呼ぶと HDD 上でシーケンシャルアクセスが実現される。
+
+        Args:
+            prefetch: True の場合、各ファイルの最初の read_id を yield する前に
+                prepare_sequential を呼び、ファイル全体の先読みを依頼する。
         """
         for filename in self.filenames:
-            for read_id in self.list_read_ids(filename, sort=True):
+            read_ids = self._sorted_read_ids(filename)
+            if prefetch:
+                self.prepare_sequential(filename)
+            for read_id in read_ids:
                 yield filename, read_id
 
+    def prepare_sequential(self, pod5_file_name: str) -> None:
+        """
+        pod5 ファイル全体をページキャッシュへ先読みするようカーネルに依頼する。
+
+        posix_fadvise(POSIX_FADV_WILLNEED) を発行して即座に戻る。
+        ファイル全体を物理位置順に読む直前に呼ぶと、後続の fetch_signal が
+        キャッシュから読めるようになる。SEQUENTIAL などのヒントは
+        open file description 単位で pod5 側のファイルハンドルに届かないため、
+        ページキャッシュ全体に効く WILLNEED のみを使う。
+        posix_fadvise がない環境 (Windows など) では何もしない。
+
+        Args:
+            pod5_file_name: Pod5 ファイル名。
+        """
+        if pod5_file_name not in self._pod5_paths:
+            raise KeyError(
+                f"Pod5 file '{pod5_file_name}' not registered. "
+                "Call add_pod5() or add_pod5_dir() first."
+            )
+        if not hasattr(os, "posix_fadvise"):
+            return
+        path = self._pod5_paths[pod5_file_name]
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError as e:
+            logger.debug("Could not open %s for prefetch: %s", path, e)
+            return
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError as e:
+            logger.debug("posix_fadvise failed for %s: %s", path, e)
+        finally:
+            os.close(fd)
+
     # ------------------------------------------------------------------
     #  シグナルアクセス
     # ------------------------------------------------------------------
@@ -257,30 +693,99 @@ class Pod5RandomAccessReader:
 
         Args:
             pod5_file_name: Pod5 ファイル名。
-            uuid: 対象の UUID。
+            uuid: 対象の UUID。16 byte の bytes を推奨 (str は変換結果をキャッシュする)。
 
         Returns:
             (offset, scale) のタプル。
         """
-        return self._get_indexer(pod5_file_name).get_calibration(uuid)
+        return self._get_indexer(pod5_file_name).get_calibration(
+            _normalize_uuid(uuid)
+        )
 
     def fetch_signal(
-        self, pod5_file_name: str, uuid: bytes | str
+        self,
+        pod5_file_name: str,
+        uuid: bytes | str,
+        *,
+        out: npt.NDArray[np.int16] | None = None,
     ) -> npt.NDArray[np.int16]:
         """
         UUID を指定してシグナルを取得する（Signal Table 直接アクセス）。
 
         Args:
             pod5_file_name: Pod5 ファイル名。
-            uuid: 対象の UUID。
+            uuid: 対象の UUID。16 byte の bytes を推奨 (str は変換結果をキャッシュする)。
+            out: 書き込み先の 1 次元 C 連続 int16 配列。
+                指定した場合は新たに配列を確保せず、out[:length] に書き込む。
 
         Returns:
-            シグナルデータ (int16)。
+            シグナルデータ (int16)。out 指定時は out の先頭スライス。
         """
-        return self._get_indexer(pod5_file_name).fetch_signal(uuid)
+        indexer = self._get_indexer(pod5_file_name)
+        uuid = _normalize_uuid(uuid)
+        if out is None:
+            return indexer.fetch_signal(uuid)
+        return out[: indexer.fetch_signal_into(uuid, out)]
 
-    def fetch_pA_signal(
+    def fetch_signal_pooled(
         self, pod5_file_name: str, uuid: bytes | str
+    ) -> npt.NDArray[np.int16]:
+        """
+        スレッドごとの配列プールのバッファにシグナルを読み込んで返す。
+
+        ループ内で大量に取得する場合の確保コストを減らす。
+        使い終わった配列は release_signal で返却すると次回以降に再利用される。
+
+        Args:
+            pod5_file_name: Pod5 ファイル名。
+            uuid: 対象の UUID。16 byte の bytes を推奨 (str は変換結果をキャッシュする)。
+
+        Returns:
+            プールのバッファ上のシグナルデータ (int16)。
+        """
+        indexer = self._get_indexer(pod5_file_name)
+        uuid = _normalize_uuid(uuid)
+        buf = self._pool.acquire(indexer.get_signal_length(uuid), np.int16)
+        return buf[: indexer.fetch_signal_into(uuid, buf)]
+
+    def release_signal(self, signal: np.ndarray) -> None:
+        """
+        fetch_signal_pooled / fetch_pA_signal_pooled で得た配列をプールに返却する。
+
+        返却後の配列は次の取得で上書きされるため、参照を保持しないこと。
+
+        Raises:
+            ValueError: プールから得た配列でない場合、または返却済みの場合。
+        """
+        self._pool.release(signal)
+
+    def fetch_signals(
+        self, pod5_file_name: str, uuids: Iterable[bytes | str]
+    ) -> list[npt.NDArray[np.int16]]:
+        """
+        複数 UUID のシグナルを一括取得する。
+
+        C++ 側で Signal Table の物理位置順に並べ替えてから 1 回の呼び出しで
+        読み込むため、fetch_signal をループで呼ぶより Python/C++ 間の往復と
+        シークが少ない。
+
+        Args:
+            pod5_file_name: Pod5 ファイル名。
+            uuids: 対象の UUID のリスト。
+
+        Returns:
+            uuids と同じ順序のシグナルデータ (int16) のリスト。
+        """
+        return self._get_indexer(pod5_file_name).fetch_signals(
+            [_normalize_uuid(u) for u in uuids]
+        )
+
+    def fetch_pA_signal(
+        self,
+        pod5_file_name: str,
+        uuid: bytes | str,
+        *,
+        out: npt.NDArray[np.float32] | None = None,
     ) -> npt.NDArray[np.float32]:
         """
         UUID を指定して pA キャリブレーション済みシグナルを取得する。
@@ -290,12 +795,38 @@ class Pod5RandomAccessReader:
 
         Args:
             pod5_file_name: Pod5 ファイル名。
-            uuid: 対象の UUID。
+            uuid: 対象の UUID。16 byte の bytes を推奨 (str は変換結果をキャッシュする)。
+            out: 書き込み先の 1 次元 C 連続 float32 配列。
+                指定した場合は新たに配列を確保せず、out[:length] に書き込む。
+
+        Returns:
+            pA 変換済みシグナルデータ (float32)。out 指定時は out の先頭スライス。
+        """
+        indexer = self._get_indexer(pod5_file_name)
+        uuid = _normalize_uuid(uuid)
+        if out is None:
+            return indexer.fetch_pA_signal(uuid)
+        return out[: indexer.fetch_pA_signal_into(uuid, out)]
+
+    def fetch_pA_signal_pooled(
+        self, pod5_file_name: str, uuid: bytes | str
+    ) -> npt.NDArray[np.float32]:
+        """
+        スレッドごとの配列プールのバッファに pA シグナルを読み込んで返す。
+
+        使い終わった配列は release_signal で返却する。
+
+        Args:
+            pod5_file_name: Pod5 ファイル名。
+            uuid: 対象の UUID。16 byte の bytes を推奨 (str は変換結果をキャッシュする)。
 
         Returns:
-            pA 変換済みシグナルデータ (float32)。
+            プールのバッファ上の pA 変換済みシグナルデータ (float32)。
         """
-        return self._get_indexer(pod5_file_name).fetch_pA_signal(uuid)
+        indexer = self._get_indexer(pod5_file_name)
+        uuid = _normalize_uuid(uuid)
+        buf = self._pool.acquire(indexer.get_signal_length(uuid), np.float32)
+        return buf[: indexer.fetch_pA_signal_into(uuid, buf)]
 
     def get_signal_length(self, pod5_file_name: str, uuid: bytes | str) -> int:
         """
@@ -303,12 +834,37 @@ class Pod5RandomAccessReader:
 
         Args:
             pod5_file_name: Pod5 ファイル名。
-            uuid: 対象の UUID。
+            uuid: 対象の UUID。16 byte の bytes を推奨 (str は変換結果をキャッシュする)。
 
         Returns:
             サンプル数。
         """
-        return self._get_indexer(pod5_file_name).get_signal_length(uuid)
+        return self._get_indexer(pod5_file_name).get_signal_length(
+            _normalize_uuid(uuid)
+        )
+
+    def get_signal_row_starts(
+        self, pod5_file_name: str, uuids: Iterable[bytes | str]
+    ) -> npt.NDArray[np.uint64]:
+        """
+        複数 UUID の Signal Table 上の開始 row をインデックスから一括取得する。
+
+        UUID を (N, 16) uint8 配列にまとめて C++ 側に 1 回で渡すため、
+        要素ごとの変換や Python レベルの lookup を行わない。
+
+        Args:
+            pod5_file_name: Pod5 ファイル名。
+            uuids: 対象の UUID のリスト。
+
+        Returns:
+            uuids と同じ順序の signal_row_start (uint64)。
+        """
+        indexer = self._get_indexer(pod5_file_name)
+        uuids_list = [_normalize_uuid(u) for u in uuids]
+        uuids_arr = _uuid_array(uuids_list)
+        if uuids_arr is None:
+            return indexer.get_signal_row_starts(uuids_list)
+        return indexer.get_signal_row_starts_array(uuids_arr)
 
     # ------------------------------------------------------------------
     #  HDD シーケンシャルアクセス最適化
@@ -326,12 +882,14 @@ class Pod5RandomAccessReader:
         任意のリストを Signal Table 上の物理位置順にソートする。
 
         ファイルごとにグルーピングし、各ファイル内で signal_row_start 昇順に
-        ソートした結果をフラットに返す。このソート順で fetch_signal を呼ぶと
-        HDD 上でシーケンシャルアクセスが実現される。
+        ソートした結果をフラットに返す。ファイルは items 内で最初に現れた順に並ぶ。
+        このソート順で fetch_signal を呼ぶと HDD 上でシーケンシャルアクセスが
+        実現される。
 
-        (filename, uuid) の指定方法は 2 通り:
+        (filename, uuid) の指定方法は 3 通り:
           - key: 各要素から (filename, uuid) を抽出する関数を渡す
           - filenames + uuids: 事前にリスト化した filename と uuid を直接渡す
+          - どちらも省略: items 自体が (filename, uuid) のタプルのリストとみなす
 
         Args:
             items: ソート対象の任意のリスト。
@@ -343,7 +901,8 @@ class Pod5RandomAccessReader:
             Signal Table の物理位置順にソートされたリスト。
 
         Raises:
-            ValueError: key も (filenames, uuids) も指定されていない場合。
+            ValueError: key も (filenames, uuids) も指定されず、
+                items が (filename, uuid) のタプルでない場合。
 
         Examples:
             key 関数を使う場合::
@@ -364,39 +923,70 @@ class Pod5RandomAccessReader:
         n = len(items)
         if n == 0:
             return []
+        if not isinstance(items, list):
+            items = list(items)
 
         # --- key 抽出 or 直接受け取り ---
         if key is not None:
             keys = [key(item) for item in items]
             fns_seq, uuids_list = zip(*keys)
-            filenames_arr = np.array(fns_seq)
             uuids_list = list(uuids_list)
         elif filenames is not None and uuids is not None:
-            filenames_arr = np.asarray(filenames)
+            fns_seq = filenames
             uuids_list = list(uuids) if not isinstance(uuids, list) else uuids
+        elif (
+            filenames is None
+            and uuids is None
+            and isinstance(items[0], tuple)
+            and len(items[0]) == 2
+        ):
+            # (filename, uuid) タプルは key 関数を呼ばずに転置だけで分解する
+            fns_seq, uuids_list = zip(*items)
+            uuids_list = list(uuids_list)
         else:
             raise ValueError("key or (filenames, uuids) must be provided")
 
-        # --- NumPy グルーピング ---
-        unique_fns, inverse, counts = np.unique(
-            filenames_arr, return_inverse=True, return_counts=True
-        )
-        group_indices = np.argsort(inverse, kind="stable")
-        splits = np.cumsum(counts[:-1])
-        groups = np.split(group_indices, splits)
+        # --- str の UUID は境界で 1 度だけ bytes に変換する ---
+        uuids_list = [_normalize_uuid(u) for u in uuids_list]
+
+        # --- 全 UUID が 16 byte の bytes なら (N, 16) uint8 配列に 1 度だけまとめる ---
+        uuids_arr = _uuid_array(uuids_list)
+
+        # ファイル名はグルーピングの等値比較にしか使わないため NumPy 配列にしない
+        fns = fns_seq if isinstance(fns_seq, list) else list(fns_seq)
+
+        # --- 全要素が同じファイルならバケツ分けせず 1 回のソートで返す ---
+        first = fns[0]
+        if n > 1 and fns[-1] == first and fns.count(first) == n:
+            indexer = self._get_indexer(first)
+            if uuids_arr is not None:
+                order = indexer.sort_indices_by_signal_row(uuids_arr)
+            else:
+                order = np.argsort(indexer.get_signal_row_starts(uuids_list))
+            return [items[i] for i in order.tolist()]
+
+        # --- ファイル名ごとのバケツ分け (ソートなしの 1 パス) ---
+        buckets: dict[str, list[int]] = {}
+        for i, fn in enumerate(fns):
+            buckets.setdefault(fn, []).append(i)
 
         # --- ファイルごとに signal_row_start 順でソート ---
         result_indices: list[np.ndarray] = []
-        for fn, idx in zip(unique_fns, groups):
+        for fn, idx_list in buckets.items():
+            idx = np.fromiter(idx_list, dtype=np.int64, count=len(idx_list))
             if len(idx) == 1:
                 result_indices.append(idx)
                 continue
-            group_uuids = itemgetter(*idx.tolist())(uuids_list)
-            starts = self._get_indexer(fn).get_signal_row_starts(group_uuids)
-            order = np.argsort(starts)
+            indexer = self._get_indexer(fn)
+            if uuids_arr is not None:
+                # lookup とソートを C++ 側で 1 回の呼び出しで行う
+                order = indexer.sort_indices_by_signal_row(uuids_arr[idx])
+            else:
+                # バケツの Python int リストをそのまま使い、tolist と可変長引数呼び出しを避ける
+                group_uuids = [uuids_list[i] for i in idx_list]
+                order = np.argsort(indexer.get_signal_row_starts(group_uuids))
             result_indices.append(idx[order])
 
-        # --- fancy index で一括取得 ---
+        # --- 並べ替え (object 配列を経由せず元の要素をそのまま返す) ---
         final_order = np.concatenate(result_indices)
-        items_arr = np.array(items, dtype=object)
-        return items_arr[final_order].tolist()
+        return [items[i] for i in final_order.tolist()]
@@ -111,12 +111,30 @@ void save_index_bin(SignalIndex const &index, std::string const &path);
 /**
  * @brief save_index_bin() が生成したファイルを読み取り再構築。
  *
+ * POSIX 環境ではファイル全体を 1 回 mmap (MAP_POPULATE) してパースし、
+ * mmap できない場合や Windows では 1 回の read で全体を読み込む。
+ *
  * @param path   入力ファイル名
  * @return       再構築されたインデックス
  * @throw        std::runtime_error  フォーマット不一致・I/O エラー時
  */
 SignalIndex load_index_bin(std::string const &path);
 
+/**
+ * @brief ファイル内の [offset, offset + length) に埋め込まれたインデックスを読み込む。
+ *
+ * 複数ファイルのインデックスを連結したバンドルファイルから、
+ * 1 ファイル分だけを取り出すために使う。形式は save_index_bin() と同じ。
+ *
+ * @param path    入力ファイル名
+ * @param offset  インデックス先頭のバイトオフセット
+ * @param length  インデックスのバイト長 (UINT64_MAX ならファイル末尾まで)
+ * @return        再構築されたインデックス
+ * @throw         std::runtime_error  フォーマット不一致・範囲外・I/O エラー時
+ */
+SignalIndex load_index_bin(std::string const &path, uint64_t offset,
+                           uint64_t length);
+
 /* ------------------------------------------------------------------ */
 /*  シグナル読み込み（Signal Table 直接アクセス）                      */
 /* ------------------------------------------------------------------ */
@@ -135,6 +153,17 @@ SignalIndex load_index_bin(std::string const &path);
  */
 std::vector<int16_t> fetch_signal(Pod5FileReader_t *reader, SigLoc const &loc);
 
+/**
+ * @brief fetch_signal() と同じ読み込みを呼び出し側のバッファに対して行う。
+ *
+ * @param reader  open 済みの Pod5FileReader
+ * @param loc     インデックスから取得した SigLoc
+ * @param out     loc.n_samples 個以上の int16 を格納できるバッファ
+ * @throw         std::runtime_error  pod5 API エラー時
+ */
+void fetch_signal_into(Pod5FileReader_t *reader, SigLoc const &loc,
+                       int16_t *out);
+
 /**
  * @brief SigLoc を使って pA キャリブレーション済みシグナルを取得する。
  *
@@ -149,6 +178,35 @@ std::vector<int16_t> fetch_signal(Pod5FileReader_t *reader, SigLoc const &loc);
  */
 std::vector<float> fetch_pA_signal(Pod5FileReader_t *reader, SigLoc const &loc);
 
+/**
+ * @brief fetch_pA_signal() と同じ変換結果を呼び出し側のバッファに書き込む。
+ *
+ * 生シグナルを out の後半にデコードしてからインプレースで変換するため、
+ * int16 の中間バッファを確保しない。
+ *
+ * @param reader  open 済みの Pod5FileReader
+ * @param loc     インデックスから取得した SigLoc
+ * @param out     loc.n_samples 個以上の float を格納できるバッファ
+ * @throw         std::runtime_error  pod5 API エラー時
+ */
+void fetch_pA_signal_into(Pod5FileReader_t *reader, SigLoc const &loc,
+                          float *out);
+
+/**
+ * @brief 複数の SigLoc のシグナルをまとめて読み込む。
+ *
+ * 全リードの signal row を Signal Table 上の物理位置順に並べ、
+ * pod5_get_signal_row_info を 1 回だけ呼んでから順にデコードする。
+ * fetch_signal() をリードごとに呼ぶより API 呼び出しとシークが少ない。
+ *
+ * @param reader  open 済みの Pod5FileReader
+ * @param locs    インデックスから取得した SigLoc の列
+ * @return        locs と同じ順序のシグナルデータ（int16 サンプル列）
+ * @throw         std::runtime_error  pod5 API エラー時
+ */
+std::vector<std::vector<int16_t>>
+fetch_signals(Pod5FileReader_t *reader, std::vector<SigLoc> const &locs);
+
 /* ------------------------------------------------------------------ */
 /*  ソート（HDD シーケンシャルアクセス最適化）                         */
 /* ------------------------------------------------------------------ */
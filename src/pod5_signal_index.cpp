@@ -2,12 +2,20 @@
 #include "pod5_format/c_api.h"
 
 #include <algorithm>
+#include <cstdint>
 #include <cstring>
 #include <fstream>
 #include <numeric>
 #include <stdexcept>
 #include <vector>
 
+#ifndef _WIN32
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
+
 namespace pod5 {
 
 static_assert(sizeof(SigLoc) == 24, "SigLoc must be 24 bytes");
@@ -109,36 +117,115 @@ void save_index_bin(const SignalIndex &idx, const std::string &path) {
   }
 }
 
-SignalIndex load_index_bin(const std::string &path) {
-  std::ifstream ifs(path, std::ios::binary);
-  if (!ifs)
-    throw std::runtime_error("open failed");
-
+/// @brief メモリ上のインデックスファイル全体をパースしてインデックスを再構築する。
+static SignalIndex parse_index_bin(char const *data, size_t size) {
   FileHeader hdr{};
-  ifs.read(reinterpret_cast<char *>(&hdr), sizeof hdr);
+  if (size < sizeof hdr)
+    throw std::runtime_error("format mismatch");
+  std::memcpy(&hdr, data, sizeof hdr);
   if (std::memcmp(hdr.magic, MAGIC, 6) || hdr.ver != VERSION)
     throw std::runtime_error("format mismatch");
 
+  constexpr size_t entry_size = sizeof(ReadId) + sizeof(SigLoc);
+  if ((size - sizeof hdr) / entry_size < hdr.entry_count)
+    throw std::runtime_error("index file truncated");
+
   SignalIndex idx;
-  idx.reserve(static_cast<size_t>(hdr.entry_count * 1.3));
+  // reserve(n) は max_load_factor を考慮して n 要素分のバケットを確保するため、
+  // 余分な係数は不要（掛けるとバケット配列が 3 割大きくなるだけ）
+  idx.reserve(static_cast<size_t>(hdr.entry_count));
 
-  for (uint64_t i = 0; i < hdr.entry_count; ++i) {
+  char const *p = data + sizeof hdr;
+  for (uint64_t i = 0; i < hdr.entry_count; ++i, p += entry_size) {
     ReadId key{};
-    ifs.read(reinterpret_cast<char *>(key.data()), key.size());
+    std::memcpy(key.data(), p, key.size());
 
     SigLoc loc{};
-    ifs.read(reinterpret_cast<char *>(&loc), sizeof loc);
+    std::memcpy(&loc, p + key.size(), sizeof loc);
 
-    idx.emplace(std::move(key), loc);
+    idx.emplace(key, loc);
   }
   return idx;
 }
 
+SignalIndex load_index_bin(const std::string &path) {
+  return load_index_bin(path, 0, UINT64_MAX);
+}
+
+SignalIndex load_index_bin(const std::string &path, uint64_t offset,
+                           uint64_t length) {
+#ifndef _WIN32
+  // mmap で 1 回だけマップし、エントリごとの read 呼び出しを避ける
+  int fd = ::open(path.c_str(), O_RDONLY);
+  if (fd < 0)
+    throw std::runtime_error("open failed");
+  struct stat st {};
+  if (::fstat(fd, &st) != 0) {
+    ::close(fd);
+    throw std::runtime_error("stat failed");
+  }
+  auto const file_size = static_cast<uint64_t>(st.st_size);
+  if (offset > file_size) {
+    ::close(fd);
+    throw std::runtime_error("index file truncated");
+  }
+  if (length == UINT64_MAX)
+    length = file_size - offset;
+  if (length > file_size - offset) {
+    ::close(fd);
+    throw std::runtime_error("index file truncated");
+  }
+  // mmap のオフセットはページ境界に揃える必要がある
+  auto const page = static_cast<uint64_t>(::sysconf(_SC_PAGESIZE));
+  auto const aligned = offset - offset % page;
+  auto const delta = static_cast<size_t>(offset - aligned);
+  auto const map_size = static_cast<size_t>(length) + delta;
+  void *map = MAP_FAILED;
+  if (length > 0) {
+    int flags = MAP_PRIVATE;
+#ifdef MAP_POPULATE
+    flags |= MAP_POPULATE;
+#endif
+    map = ::mmap(nullptr, map_size, PROT_READ, flags, fd,
+                 static_cast<off_t>(aligned));
+  }
+  ::close(fd);
+  if (map != MAP_FAILED) {
+    ::madvise(map, map_size, MADV_SEQUENTIAL);
+    try {
+      auto idx = parse_index_bin(static_cast<char const *>(map) + delta,
+                                 static_cast<size_t>(length));
+      ::munmap(map, map_size);
+      return idx;
+    } catch (...) {
+      ::munmap(map, map_size);
+      throw;
+    }
+  }
+  // mmap できないファイルシステム (一部の NFS など) はバッファ読み込みに戻る
+#endif
+  std::ifstream ifs(path, std::ios::binary | std::ios::ate);
+  if (!ifs)
+    throw std::runtime_error("open failed");
+  auto const total = static_cast<uint64_t>(ifs.tellg());
+  if (offset > total)
+    throw std::runtime_error("index file truncated");
+  if (length == UINT64_MAX)
+    length = total - offset;
+  if (length > total - offset)
+    throw std::runtime_error("index file truncated");
+  std::vector<char> buf(static_cast<size_t>(length));
+  ifs.seekg(static_cast<std::streamoff>(offset));
+  if (!ifs.read(buf.data(), static_cast<std::streamsize>(buf.size())))
+    throw std::runtime_error("read failed");
+  return parse_index_bin(buf.data(), buf.size());
+}
+
 // --------------------------------------------------------------------------
 //  シグナル読み込み（Signal Table 直接アクセス）
 // --------------------------------------------------------------------------
-std::vector<int16_t> fetch_signal(Pod5FileReader_t *reader,
-                                  SigLoc const &loc) {
+void fetch_signal_into(Pod5FileReader_t *reader, SigLoc const &loc,
+                       int16_t *out) {
   // (1) 連続する signal row indices を再構成
   std::vector<uint64_t> signal_rows(loc.signal_row_count);
   for (uint32_t i = 0; i < loc.signal_row_count; ++i) {
@@ -154,12 +241,11 @@ std::vector<int16_t> fetch_signal(Pod5FileReader_t *reader,
   }
 
   // (3) 各 signal row からサンプルを読み込み
-  std::vector<int16_t> signal(loc.n_samples);
   size_t offset = 0;
   for (uint32_t i = 0; i < loc.signal_row_count; ++i) {
     size_t chunk_samples = row_infos[i]->stored_sample_count;
     if (pod5_get_signal(reader, row_infos[i], chunk_samples,
-                        signal.data() + offset) != POD5_OK) {
+                        out + offset) != POD5_OK) {
       pod5_free_signal_row_info(loc.signal_row_count, row_infos.data());
       throw std::runtime_error("pod5_get_signal failed");
     }
@@ -168,24 +254,99 @@ std::vector<int16_t> fetch_signal(Pod5FileReader_t *reader,
 
   // (4) row info を解放
   pod5_free_signal_row_info(loc.signal_row_count, row_infos.data());
+}
 
+std::vector<int16_t> fetch_signal(Pod5FileReader_t *reader,
+                                  SigLoc const &loc) {
+  std::vector<int16_t> signal(loc.n_samples);
+  fetch_signal_into(reader, loc, signal.data());
   return signal;
 }
 
+// --------------------------------------------------------------------------
+//  複数シグナルの一括読み込み
+// --------------------------------------------------------------------------
+std::vector<std::vector<int16_t>>
+fetch_signals(Pod5FileReader_t *reader, std::vector<SigLoc> const &locs) {
+  // (1) Signal Table 上の物理位置順に並べる
+  std::vector<size_t> order(locs.size());
+  std::iota(order.begin(), order.end(), 0);
+  std::sort(order.begin(), order.end(), [&](size_t a, size_t b) {
+    return locs[a].signal_row_start < locs[b].signal_row_start;
+  });
+
+  // (2) 全リードの signal row indices を物理位置順に連結
+  size_t total_rows = 0;
+  for (auto const &loc : locs)
+    total_rows += loc.signal_row_count;
+  std::vector<uint64_t> signal_rows;
+  signal_rows.reserve(total_rows);
+  for (size_t i : order) {
+    for (uint32_t r = 0; r < locs[i].signal_row_count; ++r)
+      signal_rows.push_back(locs[i].signal_row_start + r);
+  }
+
+  std::vector<std::vector<int16_t>> signals(locs.size());
+  if (signal_rows.empty())
+    return signals;
+
+  // (3) Signal Table から row 情報を 1 回で取得
+  std::vector<SignalRowInfo_t *> row_infos(signal_rows.size());
+  if (pod5_get_signal_row_info(reader, signal_rows.size(), signal_rows.data(),
+                               row_infos.data()) != POD5_OK) {
+    throw std::runtime_error("pod5_get_signal_row_info failed");
+  }
+
+  // (4) 物理位置順にサンプルを読み込み、元の順序の位置に格納
+  size_t row = 0;
+  for (size_t i : order) {
+    auto &signal = signals[i];
+    signal.resize(locs[i].n_samples);
+    size_t offset = 0;
+    for (uint32_t r = 0; r < locs[i].signal_row_count; ++r, ++row) {
+      size_t chunk_samples = row_infos[row]->stored_sample_count;
+      if (pod5_get_signal(reader, row_infos[row], chunk_samples,
+                          signal.data() + offset) != POD5_OK) {
+        pod5_free_signal_row_info(row_infos.size(), row_infos.data());
+        throw std::runtime_error("pod5_get_signal failed");
+      }
+      offset += chunk_samples;
+    }
+  }
+
+  // (5) row info を解放
+  pod5_free_signal_row_info(row_infos.size(), row_infos.data());
+
+  return signals;
+}
+
 // --------------------------------------------------------------------------
 //  pA キャリブレーション済みシグナル読み込み
 // --------------------------------------------------------------------------
-std::vector<float> fetch_pA_signal(Pod5FileReader_t *reader,
-                                   SigLoc const &loc) {
-  auto raw = fetch_signal(reader, loc);
+void fetch_pA_signal_into(Pod5FileReader_t *reader, SigLoc const &loc,
+                          float *out) {
+  // int16 の一時バッファを確保せず、出力バッファの後半 (2n バイト目以降) に
+  // 生シグナルを直接デコードしてから前方向に変換する。
+  // out[i] の書き込み (4i..4i+3 バイト) が重なる生データは添字 i 以下のみで、
+  // いずれも読み出し済みのため、1 パスでインプレースに変換できる。
+  size_t const n = loc.n_samples;
+  auto *bytes = reinterpret_cast<unsigned char *>(out);
+  unsigned char *raw = bytes + n * sizeof(int16_t);
+  fetch_signal_into(reader, loc, reinterpret_cast<int16_t *>(raw));
 
-  std::vector<float> pA(raw.size());
   const float offset = loc.calibration_offset;
   const float scale = loc.calibration_scale;
-  for (size_t i = 0; i < raw.size(); ++i) {
-    pA[i] = (static_cast<float>(raw[i]) + offset) * scale;
+  for (size_t i = 0; i < n; ++i) {
+    int16_t v;
+    std::memcpy(&v, raw + i * sizeof(int16_t), sizeof v);
+    out[i] = (static_cast<float>(v) + offset) * scale;
   }
+}
 
+std::vector<float> fetch_pA_signal(Pod5FileReader_t *reader,
+                                   SigLoc const &loc) {
+  std::vector<float> pA(loc.n_samples);
+  fetch_pA_signal_into(reader, loc, pA.data());
   return pA;
 }
 
@@ -5,6 +5,9 @@
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
 
+#include <algorithm>
+#include <utility>
+
 namespace py = pybind11;
 using namespace pod5;
 
@@ -46,38 +49,93 @@ public:
     idx_ = pod5::load_index_bin(path);
   }
 
+  /// @brief ファイル内の指定範囲に埋め込まれたインデックスを読み込む。
+  void load_index_range(const std::string &path, uint64_t offset,
+                        uint64_t length) {
+    py::gil_scoped_release release;
+    idx_ = pod5::load_index_bin(path, offset, length);
+  }
+
   /// @brief UUID を指定してシグナルを取得する（Signal Table 直接アクセス）。
   py::array_t<int16_t> fetch_signal(py::object uuid) const {
-    ReadId id = to_read_id(uuid);
-    std::vector<int16_t> buf;
+    // 返り値の配列に直接デコードし、中間バッファからのコピーを省く
+    SigLoc const &loc = find(uuid);
+    auto arr = py::array_t<int16_t>(loc.n_samples);
+    int16_t *dst = arr.mutable_data();
     {
       py::gil_scoped_release release;
+      pod5::fetch_signal_into(reader_, loc, dst);
+    }
+    return arr;
+  }
+
+  /// @brief 複数 UUID のシグナルを一括取得する（入力と同じ順序のリスト）。
+  ///
+  /// 読み込みは Signal Table の物理位置順に 1 回の GIL 解放区間で行う。
+  py::list fetch_signals(py::iterable const &uuid_list) const {
+    std::vector<SigLoc> locs;
+    for (auto h : uuid_list) {
+      ReadId id = to_read_id(h.cast<py::object>());
       auto it = idx_.find(id);
       if (it == idx_.end())
         throw std::out_of_range("UUID not in index");
-      buf = pod5::fetch_signal(reader_, it->second);
+      locs.push_back(it->second);
     }
-    auto arr = py::array_t<int16_t>(buf.size());
-    std::memcpy(arr.mutable_data(), buf.data(), buf.size() * sizeof(int16_t));
-    return arr;
+
+    std::vector<std::vector<int16_t>> bufs;
+    {
+      py::gil_scoped_release release;
+      bufs = pod5::fetch_signals(reader_, locs);
+    }
+
+    py::list result;
+    for (auto const &buf : bufs) {
+      auto arr = py::array_t<int16_t>(buf.size());
+      std::memcpy(arr.mutable_data(), buf.data(),
+                  buf.size() * sizeof(int16_t));
+      result.append(std::move(arr));
+    }
+    return result;
   }
 
   /// @brief UUID を指定して pA キャリブレーション済みシグナルを取得する。
   py::array_t<float> fetch_pA_signal(py::object uuid) const {
-    ReadId id = to_read_id(uuid);
-    std::vector<float> buf;
+    // 返り値の配列に直接書き込み、中間バッファからのコピーを省く
+    SigLoc const &loc = find(uuid);
+    auto arr = py::array_t<float>(loc.n_samples);
+    float *dst = arr.mutable_data();
     {
       py::gil_scoped_release release;
-      auto it = idx_.find(id);
-      if (it == idx_.end())
-        throw std::out_of_range("UUID not in index");
-      buf = pod5::fetch_pA_signal(reader_, it->second);
+      pod5::fetch_pA_signal_into(reader_, loc, dst);
     }
-    auto arr = py::array_t<float>(buf.size());
-    std::memcpy(arr.mutable_data(), buf.data(), buf.size() * sizeof(float));
     return arr;
   }
 
+  /// @brief UUID のシグナルを呼び出し側の int16 配列に書き込み、サンプル数を返す。
+  size_t fetch_signal_into(py::object uuid,
+                           py::array_t<int16_t, py::array::c_style> out) const {
+    SigLoc const &loc = find_for_output(uuid, out);
+    int16_t *dst = out.mutable_data();
+    {
+      py::gil_scoped_release release;
+      pod5::fetch_signal_into(reader_, loc, dst);
+    }
+    return loc.n_samples;
+  }
+
+  /// @brief UUID の pA シグナルを呼び出し側の float32 配列に書き込み、サンプル数を返す。
+  size_t
+  fetch_pA_signal_into(py::object uuid,
+                       py::array_t<float, py::array::c_style> out) const {
+    SigLoc const &loc = find_for_output(uuid, out);
+    float *dst = out.mutable_data();
+    {
+      py::gil_scoped_release release;
+      pod5::fetch_pA_signal_into(reader_, loc, dst);
+    }
+    return loc.n_samples;
+  }
+
   /// @brief UUID のキャリブレーション情報を (offset, scale) タプルで返す。
   py::tuple get_calibration(py::object uuid) const {
     ReadId id = to_read_id(uuid);
@@ -147,19 +205,68 @@ public:
   }
 
   /// @brief UUID リストの signal_row_start を一括取得する（numpy uint64 配列）。
+  ///
+  /// UUID の変換だけを GIL 保持中に行い、lookup は GIL を解放して行う。
   py::array_t<uint64_t>
   get_signal_row_starts(py::iterable const &uuid_list) const {
-    std::vector<uint64_t> starts;
-    for (auto h : uuid_list) {
-      ReadId id = to_read_id(h.cast<py::object>());
-      auto it = idx_.find(id);
-      if (it == idx_.end())
-        throw std::out_of_range("UUID not in index");
-      starts.push_back(it->second.signal_row_start);
+    static_assert(sizeof(ReadId) == 16, "ReadId must be tightly packed");
+    std::vector<ReadId> ids;
+    for (auto h : uuid_list)
+      ids.push_back(to_read_id(h.cast<py::object>()));
+    auto arr = py::array_t<uint64_t>(ids.size());
+    uint64_t *dst = arr.mutable_data();
+    {
+      py::gil_scoped_release release;
+      lookup_row_starts(reinterpret_cast<uint8_t const *>(ids.data()),
+                        ids.size(), dst);
+    }
+    return arr;
+  }
+
+  /// @brief (N, 16) uint8 配列の UUID について signal_row_start を一括取得する。
+  ///
+  /// Python オブジェクトを 1 つずつ変換せず、GIL を解放してバッファを直接走査する。
+  py::array_t<uint64_t> get_signal_row_starts_array(
+      py::array_t<uint8_t, py::array::c_style | py::array::forcecast> const
+          &uuids) const {
+    if (uuids.ndim() != 2 || uuids.shape(1) != 16)
+      throw std::invalid_argument("UUID array must have shape (N, 16)");
+    auto const n = static_cast<size_t>(uuids.shape(0));
+    auto arr = py::array_t<uint64_t>(n);
+    uint8_t const *src = uuids.data();
+    uint64_t *dst = arr.mutable_data();
+    {
+      py::gil_scoped_release release;
+      lookup_row_starts(src, n, dst);
+    }
+    return arr;
+  }
+
+  /// @brief (N, 16) uint8 配列の UUID を signal_row_start 昇順に並べる順列を返す。
+  ///
+  /// lookup とソートを GIL を解放した 1 回の呼び出しで行い、
+  /// signal_row_start の中間配列を Python に返さない。
+  /// 同じ signal_row_start の要素は入力順を保つ。
+  py::array_t<int64_t> sort_indices_by_signal_row(
+      py::array_t<uint8_t, py::array::c_style | py::array::forcecast> const
+          &uuids) const {
+    if (uuids.ndim() != 2 || uuids.shape(1) != 16)
+      throw std::invalid_argument("UUID array must have shape (N, 16)");
+    auto const n = static_cast<size_t>(uuids.shape(0));
+    auto arr = py::array_t<int64_t>(n);
+    uint8_t const *src = uuids.data();
+    int64_t *dst = arr.mutable_data();
+    {
+      py::gil_scoped_release release;
+      std::vector<uint64_t> starts(n);
+      lookup_row_starts(src, n, starts.data());
+      std::vector<std::pair<uint64_t, int64_t>> keyed(n);
+      for (size_t i = 0; i < n; ++i)
+        keyed[i] = {starts[i], static_cast<int64_t>(i)};
+      std::sort(keyed.begin(), keyed.end());
+      for (size_t i = 0; i < n; ++i)
+        dst[i] = keyed[i].second;
     }
-    auto arr = py::array_t<uint64_t>(starts.size());
-    std::memcpy(arr.mutable_data(), starts.data(),
-                starts.size() * sizeof(uint64_t));
     return arr;
   }
 
@@ -167,6 +274,55 @@ private:
   Pod5FileReader_t *reader_{nullptr};
   SignalIndex idx_;
 
+  /// @brief 連続した 16 byte UUID 列の signal_row_start を dst に書き込む。
+  ///
+  /// GIL 非保持で呼ぶこと。ビルド後のインデックスは読み取り専用のため
+  /// 同期は不要。
+  void lookup_row_starts(uint8_t const *src, size_t n, uint64_t *dst) const {
+    ReadId id;
+    for (size_t i = 0; i < n; ++i) {
+      std::memcpy(id.data(), src + i * 16, 16);
+      auto it = idx_.find(id);
+      if (it == idx_.end())
+        throw std::out_of_range("UUID not in index");
+      dst[i] = it->second.signal_row_start;
+    }
+  }
+
+  /// @brief UUID を引いて SigLoc を返す。
+  SigLoc const &find(py::object uuid) const {
+    auto it = idx_.find(to_read_id(uuid));
+    if (it == idx_.end())
+      throw std::out_of_range("UUID not in index");
+    return it->second;
+  }
+
+  /// @brief UUID を引き、出力配列が 1 次元かつ十分な長さであることを確認する。
+  template <typename T>
+  SigLoc const &
+  find_for_output(py::object uuid,
+                  py::array_t<T, py::array::c_style> const &out) const {
+    ReadId id = to_read_id(uuid);
+    auto it = idx_.find(id);
+    if (it == idx_.end())
+      throw std::out_of_range("UUID not in index");
+    if (out.ndim() != 1)
+      throw std::invalid_argument("output array must be 1-dimensional");
+    if (static_cast<size_t>(out.shape(0)) < it->second.n_samples)
+      throw std::invalid_argument("output array is too small for the signal");
+    return it->second;
+  }
+
+  static int hex_value(char c) {
+    if (c >= '0' && c <= '9')
+      return c - '0';
+    if (c >= 'a' && c <= 'f')
+      return c - 'a' + 10;
+    if (c >= 'A' && c <= 'F')
+      return c - 'A' + 10;
+    return -1;
+  }
+
   static ReadId to_read_id(py::object obj) {
     ReadId id{};
     if (py::isinstance<py::bytes>(obj)) {
@@ -175,23 +331,66 @@ private:
         throw std::invalid_argument("UUID bytes must be length-16");
       std::memcpy(id.data(), b.data(), 16);
     } else if (py::isinstance<py::str>(obj)) {
-      std::string s = obj.cast<std::string>(), hex;
-      for (char c : s)
-        if (c != '-')
-          hex += c;
-      if (hex.size() != 32)
-        throw std::invalid_argument("UUID string must be 32 hex digits");
-      for (size_t i = 0; i < 16; ++i) {
-        unsigned v;
-        sscanf(hex.substr(i * 2, 2).c_str(), "%02x", &v);
-        id[i] = static_cast<uint8_t>(v);
+      // ハイフンを読み飛ばしつつ 16 進数を直接デコードする（一時文字列なし）
+      std::string s = obj.cast<std::string>();
+      size_t n = 0;
+      for (char c : s) {
+        if (c == '-')
+          continue;
+        int v = hex_value(c);
+        if (v < 0 || n >= 32)
+          throw std::invalid_argument("UUID string must be 32 hex digits");
+        id[n / 2] = static_cast<uint8_t>((id[n / 2] << 4) | v);
+        ++n;
       }
+      if (n != 32)
+        throw std::invalid_argument("UUID string must be 32 hex digits");
     } else
       throw std::invalid_argument("UUID must be bytes or str");
     return id;
   }
 };
 
+/* ========================================================================== */
+/*  バッチビルド                                                               */
+/* ========================================================================== */
+
+/// @brief 複数の pod5 ファイルのインデックスを 1 回の呼び出しでビルド・保存する。
+///
+/// GIL を解放したままファイルを順に処理し、Python との往復をバッチ単位に
+/// まとめる。1 ファイルの失敗で残りを止めないよう、エラーはファイルごとに
+/// メッセージとして返す（成功したファイルは空文字列）。
+std::vector<std::string>
+build_indices(std::vector<std::string> const &pod5_files,
+              std::vector<std::string> const &index_paths) {
+  if (pod5_files.size() != index_paths.size())
+    throw std::invalid_argument(
+        "pod5_files and index_paths must have the same length");
+
+  std::vector<std::string> errors(pod5_files.size());
+  py::gil_scoped_release release;
+  if (pod5_init() != POD5_OK)
+    throw std::runtime_error("pod5_init failed");
+
+  for (size_t i = 0; i < pod5_files.size(); ++i) {
+    Pod5FileReader_t *reader = pod5_open_file(pod5_files[i].c_str());
+    if (!reader) {
+      errors[i] = "pod5_open_file failed";
+      continue;
+    }
+    try {
+      auto idx = pod5::build_signal_index(reader);
+      pod5::save_index_bin(idx, index_paths[i]);
+    } catch (std::exception const &e) {
+      errors[i] = e.what();
+    }
+    pod5_close_and_free_reader(reader);
+  }
+
+  pod5_terminate();
+  return errors;
+}
+
 /* ========================================================================== */
 /*  pybind11 モジュール定義                                                    */
 /* ========================================================================== */
@@ -218,10 +417,21 @@ PYBIND11_MODULE(pod5_random_access_pybind, m) {
            "インデックスをバイナリファイルに保存")
       .def("load_index", &PyPod5Index::load_index, py::arg("path"),
            "バイナリファイルからインデックスを読み込み")
+      .def("load_index_range", &PyPod5Index::load_index_range,
+           py::arg("path"), py::arg("offset"), py::arg("length"),
+           "ファイル内の [offset, offset + length) からインデックスを読み込み")
       .def("fetch_signal", &PyPod5Index::fetch_signal, py::arg("uuid"),
            "Signal Table から直接シグナルを取得 (numpy int16 array)")
+      .def("fetch_signals", &PyPod5Index::fetch_signals, py::arg("uuids"),
+           "複数 UUID のシグナルを物理位置順に一括取得し、入力順のリストで返す")
       .def("fetch_pA_signal", &PyPod5Index::fetch_pA_signal, py::arg("uuid"),
            "pA キャリブレーション済みシグナルを取得 (numpy float32 array)")
+      .def("fetch_signal_into", &PyPod5Index::fetch_signal_into,
+           py::arg("uuid"), py::arg("out").noconvert(),
+           "シグナルを int16 配列 out の先頭に書き込み、サンプル数を返す")
+      .def("fetch_pA_signal_into", &PyPod5Index::fetch_pA_signal_into,
+           py::arg("uuid"), py::arg("out").noconvert(),
+           "pA シグナルを float32 配列 out の先頭に書き込み、サンプル数を返す")
       .def("get_calibration", &PyPod5Index::get_calibration, py::arg("uuid"),
            "インデックスから (offset, scale) タプルを返す")
       .def("get_calibration_offset", &PyPod5Index::get_calibration_offset,
@@ -238,5 +448,18 @@ PYBIND11_MODULE(pod5_random_access_pybind, m) {
            "UUID リストを Signal Table 上の物理位置順にソート")
       .def("get_signal_row_starts", &PyPod5Index::get_signal_row_starts,
            py::arg("uuids"),
-           "UUID リストの signal_row_start を一括取得 (numpy uint64 array)");
+           "UUID リストの signal_row_start を一括取得 (numpy uint64 array)")
+      .def("get_signal_row_starts_array",
+           &PyPod5Index::get_signal_row_starts_array, py::arg("uuids"),
+           "(N, 16) uint8 配列の UUID の signal_row_start を一括取得 "
+           "(numpy uint64 array)")
+      .def("sort_indices_by_signal_row",
+           &PyPod5Index::sort_indices_by_signal_row, py::arg("uuids"),
+           "(N, 16) uint8 配列の UUID を signal_row_start 昇順に並べる "
+           "順列を返す (numpy int64 array)");
+
+  m.def("build_indices", &build_indices, py::arg("pod5_files"),
+        py::arg("index_paths"),
+        "複数の pod5 ファイルのインデックスを一括ビルドして保存し、"
+        "ファイルごとのエラーメッセージ (成功時は空文字列) を返す");
 }
@@ -1,7 +1,11 @@
+import os
 from pathlib import Path
 
-from pod5_random_access.build import build_pod5_index
-from pod5_random_access.reader import INDEX_SUFFIX
+import pytest
+
+from pod5_random_access.build import BUILD_WORKERS_ENV, _env_workers, build_pod5_index
+from pod5_random_access import reader
+from pod5_random_access.reader import INDEX_SUFFIX, _is_rotational
 
 
 def test_build_creates_idx_files(pod5_dir: Path):
@@ -23,6 +27,30 @@ def test_build_skips_existing(pod5_dir: Path):
     assert built == []
 
 
+def test_build_skips_existing_relative_root(pod5_dir: Path, monkeypatch):
+    """"." のような相対パスを渡しても既存 .idx はスキップされる。"""
+    monkeypatch.chdir(pod5_dir)
+    assert len(build_pod5_index(".")) == len(list(pod5_dir.glob("*.pod5")))
+    assert build_pod5_index(".") == []
+    assert build_pod5_index("./") == []
+
+
+def test_build_skips_unreadable_subdir(pod5_dir: Path, monkeypatch):
+    """読めないサブディレクトリがあっても、残りの .pod5 はビルドされる。"""
+    locked = pod5_dir / "locked"
+    locked.mkdir()
+    scandir = os.scandir
+
+    def guarded_scandir(path):
+        if os.fspath(path) == str(locked):
+            raise PermissionError(13, "Permission denied", path)
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", guarded_scandir)
+    built = build_pod5_index(pod5_dir)
+    assert len(built) == len(list(pod5_dir.glob("*.pod5")))
+
+
 def test_build_force_rebuilds(pod5_dir: Path):
     """force=True で既存 .idx を無視して再ビルドする。"""
     build_pod5_index(pod5_dir)
@@ -32,6 +60,22 @@ def test_build_force_rebuilds(pod5_dir: Path):
     assert len(built) == len(pod5_files)
 
 
+def test_build_with_process_executor(pod5_dir: Path):
+    """executor_type="process" でも全ファイルがビルドされる。"""
+    pod5_files = sorted(pod5_dir.glob("*.pod5"))
+    built = build_pod5_index(pod5_dir, max_workers=2, executor_type="process")
+
+    assert len(built) == len(pod5_files)
+    for f in pod5_files:
+        assert (f.parent / (f.name + INDEX_SUFFIX)).exists()
+
+
+def test_build_invalid_executor_type(pod5_dir: Path):
+    """未知の executor_type は ValueError になる。"""
+    with pytest.raises(ValueError):
+        build_pod5_index(pod5_dir, executor_type="fiber")  # type: ignore[arg-type]
+
+
 def test_build_empty_dir(tmp_path: Path):
     """pod5 がないディレクトリでは空リストが返る。"""
     empty = tmp_path / "empty"
@@ -39,3 +83,44 @@ def test_build_empty_dir(tmp_path: Path):
     built = build_pod5_index(empty)
 
     assert built == []
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"), [("3", 3), ("0", None), ("abc", None), ("", None)]
+)
+def test_env_workers(monkeypatch: pytest.MonkeyPatch, value: str, expected):
+    """POD5_BUILD_WORKERS が正の整数のときだけワーカー数として採用される。"""
+    monkeypatch.setenv(BUILD_WORKERS_ENV, value)
+    assert _env_workers() == expected
+
+
+def test_build_with_env_workers(pod5_dir: Path, monkeypatch: pytest.MonkeyPatch):
+    """POD5_BUILD_WORKERS を指定しても全ファイルがビルドされる。"""
+    monkeypatch.setenv(BUILD_WORKERS_ENV, "2")
+    built = build_pod5_index(pod5_dir)
+
+    assert len(built) == len(sorted(pod5_dir.glob("*.pod5")))
+
+
+@pytest.mark.skipif(not hasattr(os, "major"), reason="requires os.major")
+def test_is_rotational_scans_sysfs_once(tmp_path: Path, monkeypatch):
+    """同じデバイス上のパスは 2 回目以降 /sys/block を走査せず表から返る。"""
+    (tmp_path / "a").mkdir()
+    monkeypatch.setattr(reader, "_ROTATIONAL_MAP", {})
+    monkeypatch.setattr(reader, "_QUEUE_DIRS", {})
+
+    scans = 0
+    build_map = reader._build_rotational_map
+
+    def counting_build():
+        nonlocal scans
+        scans += 1
+        return build_map()
+
+    monkeypatch.setattr(reader, "_build_rotational_map", counting_build)
+
+    first = _is_rotational(tmp_path)
+    second = _is_rotational(tmp_path / "a")
+
+    assert first == second
+    assert scans == 1
@@ -1,5 +1,9 @@
+import shutil
+import uuid
 from pathlib import Path
 
+import pytest
+
 from pod5_random_access.reader import Pod5RandomAccessReader
 
 
@@ -47,6 +51,68 @@ def test_plan_fetch_order_with_filenames_uuids(pod5_file: Path):
     assert sorted_by_key == sorted_by_args
 
 
+def test_plan_fetch_order_tuple_items(pod5_file: Path):
+    """(filename, uuid) タプルのリストは key 省略で key 指定と同じ結果になる。"""
+    reader = _make_reader(pod5_file)
+    name = pod5_file.name
+    read_ids = _get_read_ids(reader, pod5_file)
+
+    items = [(name, rid) for rid in read_ids]
+    sorted_by_key = reader.plan_fetch_order(items, key=lambda x: (x[0], x[1]))
+
+    assert reader.plan_fetch_order(items) == sorted_by_key
+
+
+def test_plan_fetch_order_requires_key(pod5_file: Path):
+    """タプル以外の要素で key も filenames/uuids もなければ ValueError。"""
+    reader = _make_reader(pod5_file)
+    read_ids = _get_read_ids(reader, pod5_file)
+
+    with pytest.raises(ValueError):
+        reader.plan_fetch_order(read_ids)
+
+
+def test_plan_fetch_order_bytes_uuids(pod5_file: Path):
+    """bytes UUID を渡しても str UUID と同じ順序になる。"""
+    reader = _make_reader(pod5_file)
+    name = pod5_file.name
+    read_ids = _get_read_ids(reader, pod5_file)
+
+    items = [(name, rid) for rid in read_ids]
+    sorted_by_str = reader.plan_fetch_order(items, key=lambda x: (x[0], x[1]))
+    sorted_by_bytes = reader.plan_fetch_order(
+        items, key=lambda x: (x[0], uuid.UUID(x[1]).bytes)
+    )
+
+    assert sorted_by_bytes == sorted_by_str
+
+
+def test_plan_fetch_order_multi_file(pod5_file: Path):
+    """複数ファイル混在時、ファイルは初出順にまとまり、各ファイル内は昇順になる。"""
+    other = pod5_file.with_name("other_" + pod5_file.name)
+    shutil.copy(pod5_file, other)
+    reader = Pod5RandomAccessReader()
+    reader.add_pod5(other)
+    reader.add_pod5(pod5_file)
+
+    ids_a = reader.list_read_ids(pod5_file.name)
+    ids_b = reader.list_read_ids(other.name)
+    items = [
+        pair
+        for a, b in zip(ids_a, ids_b)
+        for pair in ((pod5_file.name, a), (other.name, b))
+    ]
+    sorted_items = reader.plan_fetch_order(items, key=lambda x: (x[0], x[1]))
+
+    assert len(sorted_items) == len(items)
+    fns = [fn for fn, _ in sorted_items]
+    assert fns == [pod5_file.name] * len(ids_a) + [other.name] * len(ids_b)
+    for name in (pod5_file.name, other.name):
+        rids = [rid for fn, rid in sorted_items if fn == name]
+        starts = reader._get_indexer(name).get_signal_row_starts(rids)
+        assert list(starts) == sorted(starts)
+
+
 def test_plan_fetch_order_empty(pod5_file: Path):
     """空リストで空リストが返る。"""
     reader = _make_reader(pod5_file)
@@ -64,4 +130,4 @@ def test_plan_fetch_order_single(pod5_file: Path):
     result = reader.plan_fetch_order(items, key=lambda x: (x[0], x[1]))
 
     assert len(result) == 1
-    assert tuple(result[0]) == items[0]
+    assert result[0] is items[0]
@@ -1,10 +1,25 @@
+import os
 import pickle
+import struct
+import threading
+import time
+import tracemalloc
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import numpy as np
 import pytest
 
-from pod5_random_access.reader import INDEX_SUFFIX, Pod5RandomAccessReader
+from pod5_random_access.build import build_pod5_index, write_index_bundle
+from pod5_random_access.reader import (
+    BUNDLE_NAME,
+    INDEX_SUFFIX,
+    Pod5RandomAccessReader,
+    _normalize_uuid,
+    _read_bundle_directory,
+    _walk_pod5,
+)
 
 
 # ------------------------------------------------------------------
@@ -22,6 +37,23 @@ def test_add_pod5_builds_when_no_idx(pod5_file: Path):
     assert pod5_file.name in reader._indexers
 
 
+def test_idx_binary_header(pod5_file: Path):
+    """.idx は固定長ヘッダ (magic "P5IDX", version 1, エントリ数) と 40 byte エントリの並び。"""
+    reader = Pod5RandomAccessReader()
+    reader.add_pod5(pod5_file)
+    n = len(reader.list_read_ids(pod5_file.name))
+
+    data = (pod5_file.parent / (pod5_file.name + INDEX_SUFFIX)).read_bytes()
+    header = struct.Struct("<6sHH6xQ")
+    assert header.size == 24
+    magic, version, _, entry_count = header.unpack_from(data)
+
+    assert magic == b"P5IDX\0"
+    assert version == 1
+    assert entry_count == n
+    assert len(data) == header.size + entry_count * 40
+
+
 def test_add_pod5_defers_when_idx_exists(pod5_file: Path):
     """.idx がある状態で add_pod5 → indexer は遅延ロード（_indexers に入らない）。"""
     # まずビルドして .idx を作る
@@ -47,15 +79,142 @@ def test_add_pod5_no_save(pod5_file: Path):
     assert pod5_file.name in reader._indexers
 
 
-def test_add_pod5_dir(pod5_dir: Path):
-    """ディレクトリ内の全ファイルが _pod5_paths に登録される。"""
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_add_pod5_dir(pod5_dir: Path, max_workers: int):
+    """ディレクトリ内の全ファイルが _pod5_paths に登録される（並列数によらない）。"""
     reader = Pod5RandomAccessReader()
-    reader.add_pod5_dir(pod5_dir)
+    reader.add_pod5_dir(pod5_dir, max_workers=max_workers)
 
     pod5_files = sorted(pod5_dir.glob("*.pod5"))
     assert len(reader._pod5_paths) == len(pod5_files)
     for f in pod5_files:
-        assert f.name in reader._pod5_paths
+        assert reader._pod5_paths[f.name] == f.resolve()
+        assert f.name in reader._indexers
+
+
+def test_walk_pod5_recurses(tmp_path: Path):
+    """サブディレクトリ内の .pod5 も列挙し、.pod5 という名前のディレクトリは含めない。"""
+    (tmp_path / "sub" / "deeper").mkdir(parents=True)
+    (tmp_path / "dir.pod5").mkdir()
+    for rel in ("a.pod5", "sub/b.pod5", "sub/deeper/c.pod5", "sub/b.pod5.idx"):
+        (tmp_path / rel).touch()
+
+    found = sorted(_walk_pod5(tmp_path))
+    assert found == [
+        tmp_path / "a.pod5",
+        tmp_path / "sub" / "b.pod5",
+        tmp_path / "sub" / "deeper" / "c.pod5",
+    ]
+
+
+def test_walk_pod5_skips_unreadable_subdir(tmp_path: Path, monkeypatch):
+    """読めないサブディレクトリはスキップし、残りの .pod5 は列挙する。"""
+    (tmp_path / "a.pod5").touch()
+    (tmp_path / "locked").mkdir()
+    (tmp_path / "locked" / "b.pod5").touch()
+    scandir = os.scandir
+
+    def guarded_scandir(path):
+        if os.fspath(path) == str(tmp_path / "locked"):
+            raise PermissionError(13, "Permission denied", path)
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", guarded_scandir)
+    assert list(_walk_pod5(tmp_path)) == [tmp_path / "a.pod5"]
+
+
+def test_add_pod5_dir_builds_missing_idx(pod5_dir: Path):
+    """.idx がないファイルは add_pod5_dir でビルドされ、.idx が保存される。"""
+    reader = Pod5RandomAccessReader()
+    reader.add_pod5_dir(pod5_dir)
+
+    for f in sorted(pod5_dir.glob("*.pod5")):
+        assert f.name in reader._indexers
+        assert (f.parent / (f.name + INDEX_SUFFIX)).exists()
+
+
+def test_add_pod5_dir_build_failure_allows_retry(pod5_dir: Path, monkeypatch):
+    """ビルドに失敗したファイルは _indexers に残らず、後から再試行できる。"""
+    target = sorted(pod5_dir.glob("*.pod5"))[0]
+    reader = Pod5RandomAccessReader()
+    build = reader._build_indexer
+
+    def failing_build(path: Path, **kwargs):
+        if path.name == target.name:
+            raise RuntimeError("build failed")
+        return build(path, **kwargs)
+
+    monkeypatch.setattr(reader, "_build_indexer", failing_build)
+    with pytest.raises(RuntimeError, match="build failed"):
+        reader.add_pod5_dir(pod5_dir)
+    assert target.name not in reader._indexers
+
+    # 別のリーダーで .idx を作れば、同じリーダーから遅延ロードできる
+    Pod5RandomAccessReader().add_pod5(target)
+    assert len(reader.list_read_ids(target.name)) > 0
+
+
+def test_add_pod5_dir_invalid_max_workers(pod5_dir: Path):
+    """max_workers が 1 未満なら ValueError。"""
+    with pytest.raises(ValueError):
+        Pod5RandomAccessReader().add_pod5_dir(pod5_dir, max_workers=0)
+
+
+def test_add_pod5_dir_defers_existing_idx(pod5_dir: Path):
+    """.idx が既にあるファイルはビルドせず、遅延ロードとして登録される。"""
+    Pod5RandomAccessReader().add_pod5_dir(pod5_dir)
+
+    reader = Pod5RandomAccessReader()
+    reader.add_pod5_dir(pod5_dir)
+    assert reader._indexers == {}
+    assert len(reader._pod5_paths) == len(list(pod5_dir.glob("*.pod5")))
+
+
+def test_add_pod5_dir_uses_bundle(pod5_dir: Path):
+    """index.bundle があれば .pod5.idx がなくてもバンドルから遅延ロードされる。"""
+    build_pod5_index(pod5_dir)
+    bundle_path = write_index_bundle(pod5_dir)
+    assert bundle_path == pod5_dir / BUNDLE_NAME
+
+    pod5_files = sorted(pod5_dir.glob("*.pod5"))
+    expected = {}
+    for f in pod5_files:
+        reader = Pod5RandomAccessReader()
+        reader.add_pod5(f)
+        expected[f.name] = reader.list_read_ids(f.name)
+        (f.parent / (f.name + INDEX_SUFFIX)).unlink()
+
+    reader = Pod5RandomAccessReader()
+    reader.add_pod5_dir(pod5_dir)
+    assert reader._indexers == {}
+    for f in pod5_files:
+        assert sorted(reader.list_read_ids(f.name)) == sorted(expected[f.name])
+        assert not (f.parent / (f.name + INDEX_SUFFIX)).exists()
+
+
+def test_write_index_bundle_relative_root(pod5_dir: Path, monkeypatch):
+    """"." を渡しても既存の .pod5.idx がすべてバンドルされる。"""
+    build_pod5_index(pod5_dir)
+    monkeypatch.chdir(pod5_dir)
+    write_index_bundle(".")
+
+    entries = _read_bundle_directory(pod5_dir / BUNDLE_NAME)
+    assert sorted(entries) == sorted(f.name for f in pod5_dir.glob("*.pod5"))
+
+
+def test_add_pod5_dir_ignores_stale_bundle_entry(pod5_dir: Path):
+    """バンドル作成後に pod5 が更新されたファイルは .pod5.idx から読み込む。"""
+    build_pod5_index(pod5_dir)
+    write_index_bundle(pod5_dir)
+    stale, *fresh = sorted(pod5_dir.glob("*.pod5"))
+    st = stale.stat()
+    os.utime(stale, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    reader = Pod5RandomAccessReader()
+    reader.add_pod5_dir(pod5_dir)
+    assert stale.name not in reader._bundle_entries
+    assert all(f.name in reader._bundle_entries for f in fresh)
+    assert len(reader.list_read_ids(stale.name)) > 0
 
 
 # ------------------------------------------------------------------
@@ -81,12 +240,126 @@ def test_fetch_signal(pod5_file: Path):
     name = pod5_file.name
     read_ids = _get_read_ids(reader, pod5_file)
 
-    for rid in read_ids:
-        sig = reader.fetch_signal(name, rid)
+    # 全 read を 1 回の呼び出しで取得し、単発の fetch_signal は代表 1 件で確認する
+    signals = reader.fetch_signals(name, read_ids)
+    for rid, sig in zip(read_ids, signals):
         assert sig.dtype == np.int16
         assert len(sig) == reader.get_signal_length(name, rid)
         assert len(sig) > 0
 
+    sig = reader.fetch_signal(name, read_ids[0])
+    assert sig.dtype == np.int16
+    np.testing.assert_array_equal(sig, signals[0])
+
+
+def test_fetch_signal_out(pod5_file: Path):
+    """out 指定時は out の先頭スライスに書き込まれ、通常の取得と一致する。"""
+    reader = _make_reader(pod5_file)
+    name = pod5_file.name
+    read_ids = _get_read_ids(reader, pod5_file)
+    max_len = max(reader.get_signal_length(name, rid) for rid in read_ids)
+
+    out = np.empty(max_len, dtype=np.int16)
+    pA_out = np.empty(max_len, dtype=np.float32)
+    for rid in read_ids:
+        sig = reader.fetch_signal(name, rid, out=out)
+        assert np.shares_memory(sig, out)
+        np.testing.assert_array_equal(sig, reader.fetch_signal(name, rid))
+
+        pA = reader.fetch_pA_signal(name, rid, out=pA_out)
+        assert np.shares_memory(pA, pA_out)
+        np.testing.assert_array_equal(pA, reader.fetch_pA_signal(name, rid))
+
+
+def test_fetch_signal_out_too_small(pod5_file: Path):
+    """out が短すぎる場合は ValueError になる。"""
+    reader = _make_reader(pod5_file)
+    name = pod5_file.name
+    rid = _get_read_ids(reader, pod5_file)[0]
+
+    with pytest.raises(ValueError):
+        reader.fetch_signal(name, rid, out=np.empty(1, dtype=np.int16))
+
+
+def test_fetch_signal_pooled_reuses_buffer(pod5_file: Path):
+    """release_signal で返却したバッファが次の取得で再利用される。"""
+    reader = _make_reader(pod5_file)
+    name = pod5_file.name
+    rid = _get_read_ids(reader, pod5_file)[0]
+
+    first = reader.fetch_signal_pooled(name, rid)
+    np.testing.assert_array_equal(first, reader.fetch_signal(name, rid))
+    reader.release_signal(first)
+
+    second = reader.fetch_signal_pooled(name, rid)
+    assert np.shares_memory(first, second)
+
+
+def test_release_signal_rejects_foreign_arrays(pod5_file: Path):
+    """プールが貸し出していない配列や二重返却は ValueError で、プールに入らない。"""
+    reader = _make_reader(pod5_file)
+    name = pod5_file.name
+    rid = _get_read_ids(reader, pod5_file)[0]
+
+    with pytest.raises(ValueError):
+        reader.release_signal(np.zeros(256, dtype=np.int16))
+    with pytest.raises(ValueError):
+        reader.release_signal(reader.fetch_signal(name, rid))
+
+    pooled = reader.fetch_signal_pooled(name, rid)
+    reader.release_signal(pooled)
+    with pytest.raises(ValueError):
+        reader.release_signal(pooled)
+
+    # 1 回だけ返却されたバッファが、二重に貸し出されることはない
+    a = reader.fetch_signal_pooled(name, rid)
+    b = reader.fetch_signal_pooled(name, rid)
+    assert not np.shares_memory(a, b)
+
+
+def test_fetch_signal_with_pool(pod5_file: Path):
+    """プールのバッファを使い回すループでは新たな配列確保が発生しない。"""
+    reader = _make_reader(pod5_file)
+    name = pod5_file.name
+    read_ids = _get_read_ids(reader, pod5_file)
+    lengths = [reader.get_signal_length(name, rid) for rid in read_ids]
+
+    def sweep() -> None:
+        for rid in read_ids:
+            reader.release_signal(reader.fetch_signal_pooled(name, rid))
+
+    sweep()  # インデックスのロードなどの初回コストを除く
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        sweep()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    # tracemalloc 自身の記録用メモリは除外する
+    exclude = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    grown = sum(
+        max(stat.size_diff, 0)
+        for stat in after.filter_traces(exclude).compare_to(
+            before.filter_traces(exclude), "filename"
+        )
+    )
+    assert grown < min(lengths) * np.dtype(np.int16).itemsize
+
+
+def test_fetch_signals(pod5_file: Path):
+    """一括取得の結果が入力順で、fetch_signal と一致する。"""
+    reader = _make_reader(pod5_file)
+    name = pod5_file.name
+    read_ids = _get_read_ids(reader, pod5_file)
+
+    signals = reader.fetch_signals(name, read_ids)
+    assert len(signals) == len(read_ids)
+    for rid, sig in zip(read_ids, signals):
+        assert sig.dtype == np.int16
+        np.testing.assert_array_equal(sig, reader.fetch_signal(name, rid))
+
 
 def test_fetch_pA_signal(pod5_file: Path):
     """pA シグナルが float32 で、(raw + offset) * scale と一致する。"""
@@ -100,8 +373,42 @@ def test_fetch_pA_signal(pod5_file: Path):
     offset, scale = reader.get_calibration(name, rid)
 
     assert pA.dtype == np.float32
-    expected = (raw.astype(np.float32) + offset) * scale
-    np.testing.assert_allclose(pA, expected, rtol=1e-6)
+    # C++ 側と同じ float32 の演算順序 (cast → add → mul) なので丸めも一致する
+    expected = raw.astype(np.float32)
+    expected += np.float32(offset)
+    expected *= np.float32(scale)
+    np.testing.assert_array_equal(pA, expected)
+
+
+def test_normalize_uuid():
+    """str は 16 byte の bytes に変換され、bytes はそのまま返る。"""
+    u = uuid.uuid4()
+    assert _normalize_uuid(str(u)) == u.bytes
+    assert _normalize_uuid(u.hex) == u.bytes
+    b = u.bytes
+    assert _normalize_uuid(b) is b
+
+
+def test_fetch_signal_str_and_bytes_uuid(pod5_file: Path):
+    """str と bytes のどちらの UUID でも同じシグナルが取得できる。"""
+    reader = _make_reader(pod5_file)
+    name = pod5_file.name
+    rid = _get_read_ids(reader, pod5_file)[0]
+
+    np.testing.assert_array_equal(
+        reader.fetch_signal(name, rid),
+        reader.fetch_signal(name, uuid.UUID(rid).bytes),
+    )
+
+
+@pytest.mark.parametrize(
+    "bad", [uuid.UUID(int=0), bytearray(16), 0], ids=["UUID", "bytearray", "int"]
+)
+def test_fetch_signal_rejects_non_bytes_str_uuid(pod5_file: Path, bad: object):
+    """bytes / str 以外の UUID は ValueError になる。"""
+    reader = _make_reader(pod5_file)
+    with pytest.raises(ValueError, match="UUID must be bytes or str"):
+        reader.fetch_signal(pod5_file.name, bad)
 
 
 def test_get_calibration(pod5_file: Path):
@@ -153,9 +460,42 @@ def test_list_read_ids_sorted(pod5_file: Path):
     name = pod5_file.name
     sorted_ids = reader.list_read_ids(name, sort=True)
 
-    indexer = reader._get_indexer(name)
-    starts = indexer.get_signal_row_starts(sorted_ids)
-    assert list(starts) == sorted(starts)
+    starts = reader.get_signal_row_starts(name, sorted_ids)
+    assert isinstance(starts, np.ndarray)
+    assert starts.tolist() == sorted(starts.tolist())
+
+
+def test_get_signal_row_starts(pod5_file: Path):
+    """str と bytes のどちらの UUID でも同じ signal_row_start が返る。"""
+    reader = _make_reader(pod5_file)
+    name = pod5_file.name
+    read_ids = _get_read_ids(reader, pod5_file)
+
+    starts = reader.get_signal_row_starts(name, read_ids)
+    assert isinstance(starts, np.ndarray)
+    assert len(starts) == len(read_ids)
+    np.testing.assert_array_equal(
+        starts,
+        reader.get_signal_row_starts(name, [uuid.UUID(r).bytes for r in read_ids]),
+    )
+
+
+def test_list_read_ids_sorted_cached(pod5_file: Path):
+    """sort=True の結果はキャッシュされ、add_pod5 で同名ファイルを再登録すると破棄される。"""
+    reader = _make_reader(pod5_file)
+    name = pod5_file.name
+    first = reader.list_read_ids(name, sort=True)
+    cached = reader._sorted_cache[name]
+    expected = list(first)
+
+    # 返り値を書き換えてもキャッシュには影響しない
+    first.clear()
+    assert reader.list_read_ids(name, sort=True) == expected
+    assert [rid for _, rid in reader.iter_read_ids()] == expected
+    assert reader._sorted_cache[name] is cached
+
+    reader.add_pod5(pod5_file)
+    assert name not in reader._sorted_cache
 
 
 def test_iter_read_ids(pod5_file: Path):
@@ -168,9 +508,26 @@ def test_iter_read_ids(pod5_file: Path):
     assert all(fn == name for fn, _ in pairs)
 
     # 物理位置順であることを確認
-    indexer = reader._get_indexer(name)
-    starts = indexer.get_signal_row_starts([rid for _, rid in pairs])
-    assert list(starts) == sorted(starts)
+    starts = reader.get_signal_row_starts(name, [rid for _, rid in pairs])
+    assert isinstance(starts, np.ndarray)
+    assert starts.tolist() == sorted(starts.tolist())
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "posix_fadvise"), reason="requires os.posix_fadvise"
+)
+def test_iter_read_ids_prefetch(pod5_file: Path, monkeypatch: pytest.MonkeyPatch):
+    """prefetch=True でファイルごとに POSIX_FADV_WILLNEED が発行される。"""
+    reader = _make_reader(pod5_file)
+    calls = []
+    monkeypatch.setattr(
+        os, "posix_fadvise", lambda fd, offset, length, advice: calls.append(advice)
+    )
+
+    pairs = list(reader.iter_read_ids(prefetch=True))
+
+    assert len(pairs) == 10
+    assert calls == [os.POSIX_FADV_WILLNEED]
 
 
 def test_unknown_uuid_raises(pod5_file: Path):
@@ -205,6 +562,36 @@ def test_lazy_load_on_fetch(pod5_file: Path):
     assert len(sig) > 0
 
 
+def test_lazy_load_once_across_threads(pod5_file: Path, monkeypatch):
+    """複数スレッドから同時にアクセスしても .idx のロードは 1 回だけ行われる。"""
+    Pod5RandomAccessReader().add_pod5(pod5_file)
+    reader = Pod5RandomAccessReader()
+    reader.add_pod5_dir(pod5_file.parent)
+
+    calls = 0
+    load = reader._load_indexer
+
+    def counting_load(path: Path):
+        nonlocal calls
+        calls += 1
+        time.sleep(0.05)
+        return load(path)
+
+    monkeypatch.setattr(reader, "_load_indexer", counting_load)
+    n_threads = 8
+    barrier = threading.Barrier(n_threads)
+
+    def get(_):
+        barrier.wait()
+        return reader._get_indexer(pod5_file.name)
+
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
+        indexers = list(executor.map(get, range(n_threads)))
+
+    assert calls == 1
+    assert all(ix is indexers[0] for ix in indexers)
+
+
 # ------------------------------------------------------------------
 #  pickle
 # ------------------------------------------------------------------
@@ -217,6 +604,8 @@ def test_pickle_roundtrip(pod5_file: Path):
     read_ids = _get_read_ids(reader, pod5_file)
 
     data = pickle.dumps(reader)
+    # パスと設定だけを含み、インデックス本体は含まない
+    assert len(data) < 4096
     restored: Pod5RandomAccessReader = pickle.loads(data)
 
     # indexers はクリアされているが、fetch で再ロードされる
@@ -224,3 +613,26 @@ def test_pickle_roundtrip(pod5_file: Path):
     sig = restored.fetch_signal(name, read_ids[0])
     assert len(sig) > 0
     assert name in restored._indexers
+
+
+def test_unpickle_state_without_caches(pod5_file: Path):
+    """キャッシュ属性を含まない古い形式の state からも復元でき、fetch が動く。"""
+    reader = _make_reader(pod5_file)
+    name = pod5_file.name
+    rid = _get_read_ids(reader, pod5_file)[0]
+
+    restored = Pod5RandomAccessReader.__new__(Pod5RandomAccessReader)
+    restored.__setstate__(
+        {
+            "_pod5_paths": dict(reader._pod5_paths),
+            "_indexers": {},
+            "save_index": True,
+        }
+    )
+
+    assert restored.list_read_ids(name, sort=True) == reader.list_read_ids(
+        name, sort=True
+    )
+    np.testing.assert_array_equal(
+        restored.fetch_signal(name, rid), reader.fetch_signal(name, rid)
+    )